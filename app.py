@@ -1,7 +1,9 @@
+import os
 import streamlit as st
-from ats_engine import read_pdf, read_docx, baseline_ats_score, job_match_score
-import plotly.graph_objects as go
-import plotly.express as px
+from cache import ScanCache, scan_resume, file_digest
+from history import ScanHistory
+from report import gauge_spec, category_spec, text_report, json_report, csv_report
+from instrument import span
 from datetime import datetime
 
 # ---------- PAGE CONFIG ----------
@@ -199,6 +201,27 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# ---------- CACHED PIPELINE ----------
+# Widget interactions rerun this whole script; everything below is memoized
+# so reruns don't re-parse or re-score; report.py caches charts and reports.
+@st.cache_resource
+def get_scan_cache():
+    """Scan cache shared by all sessions"""
+    return ScanCache(os.environ.get("ATS_CACHE_PATH", ".ats_cache.sqlite3"))
+
+@st.cache_resource
+def get_scan_history():
+    """Scan log and running totals shared by all sessions"""
+    return ScanHistory(os.environ.get("ATS_HISTORY_PATH", ".ats_history.sqlite3"))
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def analyze(data, filename, job_description):
+    """Parse and score an upload, keyed by its bytes and the job description"""
+    return scan_resume(data, filename, job_description, get_scan_cache())
+
+def reset_analysis():
+    st.session_state.analyzed = False
+
 # ---------- SIDEBAR ----------
 with st.sidebar:
     st.title("⚙️ Settings")
@@ -237,7 +260,8 @@ with col1:
     st.markdown("**Optimize your resume for Applicant Tracking Systems**")
 
 with col2:
-    st.metric("Total Scans", "1,234", "+12%")
+    # Filled in at the end of the run, so it counts a scan made on this run
+    total_scans = st.empty()
 
 st.markdown("---")
 
@@ -249,7 +273,8 @@ with col1:
     resume_file = st.file_uploader(
         "Upload Your Resume (PDF / DOCX)",
         type=["pdf", "docx"],
-        help="Upload your resume in PDF or DOCX format"
+        help="Upload your resume in PDF or DOCX format",
+        on_change=reset_analysis
     )
 
 with col2:
@@ -265,20 +290,27 @@ with col2:
 
 # ---------- ANALYZE BUTTON ----------
 if resume_file:
-    if st.button("🚀 Analyze Resume", use_container_width=True):
+    clicked = st.button("🚀 Analyze Resume", use_container_width=True)
+    if clicked:
+        st.session_state.analyzed = True
+
+    # Keep showing results across reruns (mode switch, download, ...)
+    if st.session_state.get("analyzed"):
         with st.spinner("🔍 Analyzing your resume..."):
-            # Read resume
-            if resume_file.name.endswith(".pdf"):
-                resume_text = read_pdf(resume_file)
-            else:
-                resume_text = read_docx(resume_file)
+            # Read and score resume (cached by file content)
+            resume_text, result = analyze(
+                resume_file.getvalue(), resume_file.name, job_description
+            )
+            score = result.score
+            skills = result.skills_found
+            warnings = result.warnings
+            match_score = result.match_percentage
 
-            # Get ATS score
-            if job_description:
-                score, skills, missing, warnings, match_score = job_match_score(resume_text, job_description)
-            else:
-                score, skills, missing, warnings = baseline_ats_score(resume_text)
-                match_score = None
+        # Reruns redraw the same result; only a click is a new scan
+        if clicked:
+            get_scan_history().record(
+                result, file_digest(resume_file.getvalue()), job_description
+            )
 
         st.success("✅ Analysis Complete!")
         
@@ -296,54 +328,21 @@ if resume_file:
             st.metric("Skills Found", len(skills))
         
         with col3:
-            st.metric("Missing Skills", len(missing))
+            st.metric("Missing Skills", result.missing_count)
         
         with col4:
             if match_score:
                 st.metric("Job Match", f"{match_score}%")
             else:
-                st.metric("Word Count", len(resume_text.split()))
+                st.metric("Word Count", result.word_count)
         
         # Score Gauge Chart
         st.markdown("---")
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            # Create gauge chart with better colors
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=score,
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "ATS Score", 'font': {'size': 24, 'color': '#1e293b'}},
-                delta={'reference': 70, 'increasing': {'color': "#10b981"}},
-                number={'font': {'size': 40, 'color': '#1e293b'}},
-                gauge={
-                    'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': "#64748b"},
-                    'bar': {'color': "#6366f1", 'thickness': 0.8},
-                    'bgcolor': "#f8fafc",
-                    'borderwidth': 3,
-                    'bordercolor': "#cbd5e1",
-                    'steps': [
-                        {'range': [0, 50], 'color': '#fee2e2'},
-                        {'range': [50, 75], 'color': '#fef3c7'},
-                        {'range': [75, 100], 'color': '#d1fae5'}
-                    ],
-                    'threshold': {
-                        'line': {'color': "#ef4444", 'width': 4},
-                        'thickness': 0.8,
-                        'value': 90
-                    }
-                }
-            ))
-            
-            fig.update_layout(
-                height=300,
-                margin=dict(l=20, r=20, t=50, b=20),
-                paper_bgcolor="#ffffff",
-                font={'color': "#1e293b", 'family': "Inter"}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            with span("render", chart="gauge"):
+                st.plotly_chart(gauge_spec(result), use_container_width=True)
         
         with col2:
             st.markdown("### 🎯 Score Breakdown")
@@ -355,11 +354,13 @@ if resume_file:
             else:
                 st.error("❌ Needs significant optimization.")
             
+            components = result.components
             st.markdown(f"""
             **Score Components:**
-            - Skills Coverage: {min(45, len(skills) * 2)}%
-            - Sections: {min(25, len([s for s in ['experience', 'education', 'projects'] if s in resume_text.lower()]) * 8)}%
-            - Length: {15 if 350 <= len(resume_text.split()) <= 900 else 7}%
+            - Skills Coverage: {components.skills}/45
+            - Sections: {components.sections}/25
+            - Length: {components.length}/15
+            - Format: {components.format}/15
             """)
         
         # Skills Analysis
@@ -380,9 +381,9 @@ if resume_file:
         
         with col2:
             st.subheader("❌ Missing Common Skills")
-            if missing:
+            if result.missing_count:
                 # Show top 10 missing skills
-                missing_list = list(missing)[:10]
+                missing_list = result.missing_skills[:10]
                 for skill in sorted(missing_list):
                     st.markdown(f"○ `{skill.title()}`")
             else:
@@ -393,46 +394,8 @@ if resume_file:
             st.markdown("---")
             st.subheader("📈 Skills Distribution")
             
-            from skills import SOFTWARE_SKILLS
-            
-            categories_count = {
-                "Languages": 0,
-                "Frameworks": 0,
-                "Databases": 0,
-                "Tools": 0
-            }
-            
-            for skill in skills:
-                if skill in SOFTWARE_SKILLS["languages"]:
-                    categories_count["Languages"] += 1
-                elif skill in SOFTWARE_SKILLS["frameworks"]:
-                    categories_count["Frameworks"] += 1
-                elif skill in SOFTWARE_SKILLS["databases"]:
-                    categories_count["Databases"] += 1
-                elif skill in SOFTWARE_SKILLS["tools"]:
-                    categories_count["Tools"] += 1
-            
-            fig = px.bar(
-                x=list(categories_count.keys()),
-                y=list(categories_count.values()),
-                labels={'x': 'Category', 'y': 'Count'},
-                title="Skills by Category",
-                color=list(categories_count.values()),
-                color_continuous_scale=['#6366f1', '#8b5cf6']
-            )
-            
-            fig.update_layout(
-                showlegend=False,
-                height=300,
-                paper_bgcolor="#ffffff",
-                plot_bgcolor="#ffffff",
-                font={'family': "Inter", 'color': '#1e293b'},
-                title_font_color='#1e293b',
-                xaxis={'gridcolor': '#e2e8f0', 'color': '#1e293b'},
-                yaxis={'gridcolor': '#e2e8f0', 'color': '#1e293b'}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            with span("render", chart="categories"):
+                st.plotly_chart(category_spec(result), use_container_width=True)
         
         # Warnings
         if warnings:
@@ -469,28 +432,36 @@ if resume_file:
         
         # Download Report
         st.markdown("---")
-        report = f"""
-        ATS RESUME ANALYSIS REPORT
-        Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}
-        
-        SCORE: {score}/100
-        SKILLS FOUND: {len(skills)}
-        MISSING SKILLS: {len(missing)}
-        
-        DETECTED SKILLS:
-        {', '.join(sorted(skills))}
-        
-        RECOMMENDATIONS:
-        {chr(10).join(f'- {w}' for w in warnings)}
-        """
-        
-        st.download_button(
-            label="📥 Download Report",
-            data=report,
-            file_name=f"ats_report_{datetime.now().strftime('%Y%m%d')}.txt",
-            mime="text/plain",
-            use_container_width=True
-        )
+        now = datetime.now()
+        stem = f"ats_report_{now.strftime('%Y%m%d')}"
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.download_button(
+                label="📥 Download Report",
+                data=text_report(result, now.strftime("%Y-%m-%d %H:%M")),
+                file_name=f"{stem}.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
+
+        with col2:
+            st.download_button(
+                label="📥 JSON",
+                data=json_report(result, resume_file.name),
+                file_name=f"{stem}.json",
+                mime="application/json",
+                use_container_width=True
+            )
+
+        with col3:
+            st.download_button(
+                label="📥 CSV",
+                data=csv_report(result, resume_file.name),
+                file_name=f"{stem}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
 
 else:
     # Landing section
@@ -517,4 +488,8 @@ else:
         st.markdown("""
         ### 3️⃣ Optimize
         Get actionable insights to improve your score
-        """)
\ No newline at end of file
+        """)
+
+# ---------- SCAN COUNT ----------
+scans, scans_today = get_scan_history().scan_counts()
+total_scans.metric("Total Scans", f"{scans:,}", f"+{scans_today:,} today")
@@ -0,0 +1,143 @@
+import os
+import mmap
+import zlib
+import struct
+import tarfile
+import zipfile
+import functools
+from collections import namedtuple
+
+# Leading bytes of compressed tarballs, which can only be read sequentially
+COMPRESSED_MAGIC = (b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00")
+
+ZIP_LOCAL_HEADER = struct.Struct("<4s22xHH")
+ZIP_LOCAL_MAGIC = b"PK\x03\x04"
+
+
+# ---------- MEMBERS ----------
+class ArchiveMember(namedtuple("ArchiveMember", "archive name offset size compressed_size method crc data")):
+    """One file inside a ZIP or tar archive
+
+    Small enough to pickle to a worker: stored and deflated members are
+    located by byte offset in the archive, and each process slices them out
+    of its own read-only mapping of the file. Only members of compressed
+    tarballs, which can't be mapped, carry their bytes in `data`.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return os.path.join(self.archive, self.name)
+
+
+@functools.lru_cache(maxsize=16)
+def map_file(path):
+    """Read-only mmap of a file, shared by every member read from it"""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def member_data(member):
+    """Bytes of an archive member; a zero-copy memoryview when stored uncompressed"""
+    if member.data is not None:
+        return member.data
+
+    mapped = map_file(member.archive)
+    raw = memoryview(mapped)[member.offset:member.offset + member.compressed_size]
+    if member.method == "stored":
+        data = raw
+    elif member.method == "deflated":
+        # Never inflate past the declared size (zip bombs)
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        data = inflater.decompress(raw, member.size + 1)
+        if len(data) != member.size:
+            raise ValueError(f"{member.name}: size does not match the archive directory")
+    else:
+        raise ValueError(f"{member.name}: unsupported compression ({member.method})")
+
+    if member.crc is not None and zlib.crc32(data) != member.crc:
+        raise ValueError(f"{member.name}: CRC check failed")
+    return data
+
+
+# ---------- ARCHIVES ----------
+def archive_format(path):
+    """"zip", "tar" or None, from the file's leading bytes
+
+    zipfile.is_zipfile alone is not enough: it also accepts a tarball that
+    happens to contain a ZIP (every DOCX is one).
+    """
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        head = f.read(512)
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "zip"
+    if head[257:262] == b"ustar" or (head.startswith(COMPRESSED_MAGIC) and tarfile.is_tarfile(path)):
+        return "tar"
+    return None
+
+def is_archive(path):
+    return archive_format(path) is not None
+
+def iter_members(path, select=None):
+    """Yield an ArchiveMember per regular file in a ZIP or tar archive
+
+    Members are listed lazily and nothing is extracted; `select(name)`
+    may skip members by name before any of their bytes are read.
+    """
+    fmt = archive_format(path)
+    if fmt == "zip":
+        members = _zip_members(path)
+    elif fmt == "tar":
+        members = _tar_members(path, select)
+    else:
+        raise ValueError(f"{path} is not a ZIP or tar archive")
+    for member in members:
+        if select is None or select(member.name):
+            yield member
+
+def _zip_members(path):
+    mapped = map_file(path)
+    # ZipFile only reads the central directory here; member bytes come from the mapping
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+
+    for info in infos:
+        if info.is_dir():
+            continue
+        magic, name_length, extra_length = ZIP_LOCAL_HEADER.unpack_from(mapped, info.header_offset)
+        if magic != ZIP_LOCAL_MAGIC:
+            raise ValueError(f"{path}: bad local header for {info.filename}")
+        if info.flag_bits & 0x1:
+            method = "encrypted"
+        else:
+            method = {zipfile.ZIP_STORED: "stored", zipfile.ZIP_DEFLATED: "deflated"}.get(
+                info.compress_type, f"zip method {info.compress_type}")
+        yield ArchiveMember(
+            path, info.filename,
+            info.header_offset + ZIP_LOCAL_HEADER.size + name_length + extra_length,
+            info.file_size, info.compress_size, method, info.CRC, None,
+        )
+
+def _tar_members(path, select):
+    with open(path, "rb") as f:
+        compressed = f.read(6).startswith(COMPRESSED_MAGIC)
+
+    if not compressed:
+        with tarfile.open(path, "r:") as archive:
+            while (info := archive.next()) is not None:
+                # Headers are read one at a time; don't keep them all
+                archive.members.clear()
+                if info.isfile() and not info.issparse():
+                    yield ArchiveMember(path, info.name, info.offset_data, info.size,
+                                        info.size, "stored", None, None)
+        return
+
+    # Compressed tarballs are decompressed as a stream, one member at a time
+    with tarfile.open(path, "r|*") as archive:
+        while (info := archive.next()) is not None:
+            archive.members.clear()
+            if not info.isfile() or (select is not None and not select(info.name)):
+                continue
+            data = archive.extractfile(info).read()
+            yield ArchiveMember(path, info.name, 0, len(data), len(data), "inline", None, data)
@@ -1,64 +1,255 @@
+import os
 import re
-from PyPDF2 import PdfReader
-from docx import Document
-from skills import SOFTWARE_SKILLS
+import hashlib
+import threading
+from collections import namedtuple, OrderedDict
+from taxonomy import load_taxonomy
+from matcher import tokenize, iter_windows, WINDOW_CHARS
+from parsers import iter_segments
+from instrument import span, traced
+
+# Bundled skills unless ATS_TAXONOMY points to a JSON or binary taxonomy file
+TAXONOMY = load_taxonomy(os.environ.get("ATS_TAXONOMY"))
+
+# Compiled once at import, shared by every call (and by ScoringPool workers,
+# which fork from a server that imported this module)
+SKILL_MATCHER = TAXONOMY.matcher
+
+# All known software skills
+ALL_SKILLS = set(TAXONOMY.skills)
+
+# Skill -> taxonomy ID, the bit position in result skill bitsets
+SKILL_IDS = TAXONOMY.skill_ids
+ALL_SKILL_BITS = (1 << len(TAXONOMY.skills)) - 1
+
+# Changes whenever the taxonomy does, so cached scores can be invalidated
+TAXONOMY_VERSION = TAXONOMY.version
+
+# Bumped whenever scoring semantics change, so cached scores are invalidated
+SCORING_VERSION = 5
+
+# Resumes beyond these sizes are outliers (portfolios, scanned books, ...)
+MAX_PDF_PAGES = 50
+MAX_TEXT_CHARS = 500_000
+
+# Section headings the baseline score looks for, and every word prefix it checks
+SECTIONS = ("experience", "education", "projects", "skills", "github", "certifications")
+MENTIONS = SECTIONS + ("linkedin",)
 
 # ---------- FILE PARSING ----------
-def read_pdf(file):
+# Backends live in parsers.py, fastest available first, and import their
+# libraries on first use: scoring plain text needs only the standard library.
+def iter_pdf_pages(file, max_pages=MAX_PDF_PAGES, max_chars=MAX_TEXT_CHARS):
+    """Lazily yield the text of each PDF page
+
+    Each page is extracted once. Extraction stops after `max_pages` pages or
+    once `max_chars` characters have been produced (None disables a limit).
+    """
+    remaining = max_chars
+
+    for number, text in enumerate(iter_segments(file, "pdf")):
+        if max_pages is not None and number >= max_pages:
+            break
+        if not text:
+            continue
+        if remaining is not None:
+            text = text[:remaining]
+            remaining -= len(text)
+        yield text
+        if remaining == 0:
+            break
+
+def read_pdf(file, max_pages=MAX_PDF_PAGES, max_chars=MAX_TEXT_CHARS):
     """Extract text from PDF file"""
-    reader = PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        if page.extract_text():
-            text += page.extract_text()
+    with span("parse", format="pdf") as s:
+        pages = list(iter_pdf_pages(file, max_pages, max_chars))
+        text = "".join(pages)
+        s.set(pages=len(pages), bytes=len(text))
     return text
 
+def iter_docx_paragraphs(file):
+    """Yield the text of each DOCX paragraph"""
+    return iter_segments(file, "docx")
+
 def read_docx(file):
     """Extract text from DOCX file"""
-    doc = Document(file)
-    return " ".join(p.text for p in doc.paragraphs)
+    with span("parse", format="docx") as s:
+        text = " ".join(iter_docx_paragraphs(file))
+        s.set(bytes=len(text))
+    return text
+
+def read_document(file, fmt):
+    """Extract text from a PDF or DOCX path or file object of a known format"""
+    if fmt == "pdf":
+        return read_pdf(file)
+    if fmt == "docx":
+        return read_docx(file)
+    raise ValueError("Unsupported file type; expected a PDF or DOCX file")
 
 # ---------- CLEAN TEXT ----------
+@traced("clean")
 def clean(text):
     """Normalize text for processing"""
     text = text.lower()
     return re.sub(r"[^a-z0-9\s]", " ", text)
 
 # ---------- SKILL EXTRACTION ----------
+@traced("extract")
 def extract_skills(text):
     """Extract all software skills from text"""
-    text = clean(text)
-    found = set()
+    return SKILL_MATCHER.find(text)
+
+@traced("extract")
+def extract_skills_stream(chunks):
+    """Extract skills from text chunks (e.g. iter_pdf_pages) without joining them"""
+    return SKILL_MATCHER.find_chunks(chunks)
+
+# ---------- RESULTS ----------
+# Points each part of the baseline score contributed (out of 45/25/15/15)
+ScoreComponents = namedtuple("ScoreComponents", ["skills", "sections", "length", "format"])
+
+def skill_bits(skills):
+    """Bitset of taxonomy IDs for skill names; unknown names are ignored"""
+    bits = 0
+    for skill in skills:
+        i = SKILL_IDS.get(skill)
+        if i is not None:
+            bits |= 1 << i
+    return bits
+
+def skill_names(bits):
+    """Skill names in a bitset, in taxonomy order"""
+    names = []
+    skills = TAXONOMY.skills
+    while bits:
+        low = bits & -bits
+        names.append(skills[low.bit_length() - 1])
+        bits ^= low
+    return names
 
-    for category in SOFTWARE_SKILLS.values():
-        for skill in category:
-            # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text):
-                found.add(skill)
 
-    return found
+class ScanResult:
+    """Score of one resume
+
+    Found skills are kept as a bitset over taxonomy IDs (a ~20 byte int)
+    and expanded to names only when asked for; missing skills are its
+    complement. `match_percentage` is None unless a job description was
+    matched.
+    """
+
+    __slots__ = ("score", "skill_bits", "warnings", "components",
+                 "word_count", "match_percentage")
+
+    def __init__(self, score, skill_bits, warnings, components, word_count,
+                 match_percentage=None):
+        self.score = score
+        self.skill_bits = skill_bits
+        self.warnings = warnings
+        self.components = components
+        self.word_count = word_count
+        self.match_percentage = match_percentage
+
+    @property
+    def skills_found(self):
+        return skill_names(self.skill_bits)
+
+    @property
+    def missing_skills(self):
+        return skill_names(ALL_SKILL_BITS & ~self.skill_bits)
+
+    @property
+    def skill_count(self):
+        return self.skill_bits.bit_count()
+
+    @property
+    def missing_count(self):
+        return len(TAXONOMY.skills) - self.skill_bits.bit_count()
+
+    def __eq__(self, other):
+        if not isinstance(other, ScanResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"ScanResult(score={self.score}, skills={self.skill_count}, "
+                f"match_percentage={self.match_percentage})")
 
 # ---------- BASELINE ATS SCORE (NO JOB DESCRIPTION) ----------
+@traced("score")
 def baseline_ats_score(resume_text):
     """Calculate ATS score without job description"""
-    resume = resume_text.lower()
-    skills_found = extract_skills(resume)
+    if len(resume_text) > 2 * WINDOW_CHARS:
+        # Don't build full-size lowercase copies and token lists
+        return baseline_ats_score_chunks((resume_text,))
+    # One tokenizer pass feeds skills, sections, length and format checks;
+    # it takes the place of the clean stage
+    with span("clean", bytes=len(resume_text)):
+        resume = tokenize(resume_text)
+    with span("extract", tokens=len(resume.tokens)):
+        skills_found = SKILL_MATCHER.find_tokens(resume)
+    return score_tokens(resume, skills_found)
+
+def baseline_ats_score_chunks(chunks):
+    """baseline_ats_score of the joined chunks, one window at a time
+
+    Text is tokenized in windows of about WINDOW_CHARS that overlap by a
+    few words, so multi-word skills across a boundary are still found.
+    Skills, mentions and word counts are accumulated as it goes, and
+    peak memory does not grow with the document.
+    """
+    resume = WindowedStream()
+    skills_found = set()
+    for window, repeated in iter_windows(chunks, SKILL_MATCHER.max_words - 1):
+        with span("clean", bytes=len(window)):
+            stream = tokenize(window)
+        with span("extract", tokens=len(stream.tokens)):
+            SKILL_MATCHER.find_tokens(stream, skills_found)
+        resume.add(stream, repeated)
+    return score_tokens(resume, skills_found)
+
+class WindowedStream:
+    """TokenStream stand-in accumulated over windows of one document
+
+    Keeps only what score_tokens reads: the word count, the symbols seen,
+    whether there is an email and which MENTIONS prefixes occur.
+    """
+
+    __slots__ = ("word_count", "symbols", "has_email", "mentioned")
+
+    def __init__(self):
+        self.word_count = 0
+        self.symbols = set()
+        self.has_email = False
+        self.mentioned = set()
+
+    def add(self, stream, repeated=0):
+        """Fold in a window's TokenStream; its first `repeated` words were counted already"""
+        self.word_count += stream.word_count - repeated
+        self.symbols |= stream.symbols
+        self.has_email = self.has_email or stream.has_email
+        self.mentioned.update(p for p in MENTIONS if p not in self.mentioned and stream.mentions(p))
+
+    def mentions(self, prefix):
+        if prefix not in MENTIONS:
+            raise KeyError(f"{prefix!r} is not tracked; add it to MENTIONS")
+        return prefix in self.mentioned
 
-    # All known software skills
-    all_skills = set(
-        skill for group in SOFTWARE_SKILLS.values() for skill in group
-    )
+def score_tokens(resume, skills_found):
+    """Baseline score from a tokenized resume and the skills found in it
+
+    `resume` is a TokenStream or anything with the same word_count,
+    symbols, has_email and mentions().
+    """
+    all_skills = ALL_SKILLS
 
     # ---- Skill coverage (45 points) ----
     skill_score = (len(skills_found) / len(all_skills)) * 45 if all_skills else 0
 
     # ---- Sections (25 points) ----
-    sections = ["experience", "education", "projects", "skills", "github", "certifications"]
-    section_score = (sum(1 for s in sections if s in resume) / len(sections)) * 25
+    section_score = (sum(1 for s in SECTIONS if resume.mentions(s)) / len(SECTIONS)) * 25
 
     # ---- Length (15 points) ----
-    words = len(resume.split())
+    words = resume.word_count
     if 350 <= words <= 900:
         length_score = 15
     elif 250 <= words < 350 or 900 < words <= 1000:
@@ -70,17 +261,17 @@ def baseline_ats_score(resume_text):
     format_score = 15
     
     # Check for common ATS-friendly elements
-    if "•" in resume_text or "-" in resume_text:  # Bullet points
+    if "•" in resume.symbols or "-" in resume.symbols:  # Bullet points
         format_score += 0
-    if "@" in resume_text and "." in resume_text:  # Email
+    if resume.has_email:  # Email
         format_score += 0
-    if "linkedin" in resume or "github" in resume:  # Social links
+    if resume.mentions("linkedin") or resume.mentions("github"):  # Social links
         format_score += 0
 
     # ---- Warnings ----
     warnings = []
     
-    if "|" in resume or "│" in resume:
+    if "|" in resume.symbols or "│" in resume.symbols:
         warnings.append("Avoid tables – ATS systems may fail to parse them.")
         format_score -= 5
     
@@ -93,46 +284,231 @@ def baseline_ats_score(resume_text):
     if len(skills_found) < 5:
         warnings.append("Add more relevant technical skills to improve your ATS score.")
     
-    if "experience" not in resume:
+    if not resume.mentions("experience"):
         warnings.append("Include an 'Experience' or 'Work Experience' section.")
     
-    if "education" not in resume:
+    if not resume.mentions("education"):
         warnings.append("Include an 'Education' section.")
     
     # Check for contact info
-    if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):
+    if not resume.has_email:
         warnings.append("Add an email address for contact information.")
     
     # Calculate total score
     total = skill_score + section_score + length_score + format_score
     total = min(round(total, 2), 100)
 
-    missing_skills = all_skills - skills_found
+    components = ScoreComponents(round(skill_score, 2), round(section_score, 2),
+                                 length_score, format_score)
+    return ScanResult(total, skill_bits(skills_found), warnings, components, words)
+
+# ---------- JOB PROFILES ----------
+# Weight of a JD skill by where it is mentioned
+REQUIRED_WEIGHT = 1.5   # "Requirements:", "must have", ...
+DEFAULT_WEIGHT = 1.0    # no cue either way
+PREFERRED_WEIGHT = 0.5  # "Nice to have:", "... is a plus", ...
+
+# Each repeated mention adds this much (relative), up to MAX_MENTIONS.
+# All weights stay multiples of 1/8, so sums and percentages are exact.
+REPEAT_BONUS = 0.25
+MAX_MENTIONS = 3
+
+REQUIRED_CUES = re.compile(
+    r"\b(required|requirements?|must|minimum|essential|mandatory|qualifications)\b"
+)
+PREFERRED_CUES = re.compile(
+    r"\b(nice to have|good to have|preferred|bonus|plus|desirable|optional|ideally|familiarity)\b"
+)
+# What a cue-only heading ("Nice to have", "Minimum Requirements") has left
+# once its cues are removed
+CUE_PUNCTUATION_RE = re.compile(r"[\W_]+")
+SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+# Non-empty lines, as str.splitlines() breaks them, found one at a time
+LINE_RE = re.compile(r"[^\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]+")
+
+def _only_cues(line):
+    """Is a lowercased line nothing but required/preferred cues"""
+    rest = PREFERRED_CUES.sub(" ", REQUIRED_CUES.sub(" ", line))
+    return rest != line and not CUE_PUNCTUATION_RE.sub("", rest)
+
+
+class JobProfile:
+    """Weighted skills of one job description, compiled once per requisition
+
+    Reuse one profile for every resume matched against the same job; it
+    pickles to a few hundred bytes, so it is cheap to send to workers.
+    """
+
+    __slots__ = ("weights", "required", "skill_bits", "required_bits",
+                 "total_weight", "_weight_by_id")
+
+    def __init__(self, weights, required=()):
+        self.weights = dict(weights)
+        self.required = frozenset(required)
+        self.skill_bits = skill_bits(self.weights)
+        self.required_bits = skill_bits(self.required)
+        self.total_weight = sum(self.weights.values())
+        self._weight_by_id = {SKILL_IDS[s]: w for s, w in self.weights.items() if s in SKILL_IDS}
+
+    @classmethod
+    def from_text(cls, job_description):
+        """Extract skills with weights from section headings, cues and repeats"""
+        base = {}      # skill -> highest weight of any mention
+        mentions = {}  # skill -> sentences mentioning it
+        required = set()
+        section = DEFAULT_WEIGHT
+
+        # Lines are walked lazily: pasted JDs can be megabytes long
+        for match in LINE_RE.finditer(job_description):
+            line = match.group().strip().lstrip("-*•#").strip()
+            if not line:
+                continue
+            lower = line.lower()
+
+            # Short headings like "Nice to have:" set the weight of what follows
+            if len(line.split()) <= 6 and (line.endswith(":") or _only_cues(lower)):
+                if PREFERRED_CUES.search(lower):
+                    section = PREFERRED_WEIGHT
+                    continue
+                if REQUIRED_CUES.search(lower):
+                    section = REQUIRED_WEIGHT
+                    continue
+                if line.endswith(":"):
+                    section = DEFAULT_WEIGHT
+                    continue
+
+            for sentence in SENTENCE_RE.split(lower):
+                skills = extract_skills(sentence)
+                if not skills:
+                    continue
+                if PREFERRED_CUES.search(sentence):
+                    weight = PREFERRED_WEIGHT
+                elif REQUIRED_CUES.search(sentence):
+                    weight = REQUIRED_WEIGHT
+                else:
+                    weight = section
+                for skill in skills:
+                    base[skill] = max(base.get(skill, 0), weight)
+                    mentions[skill] = mentions.get(skill, 0) + 1
+                    if weight == REQUIRED_WEIGHT:
+                        required.add(skill)
+
+        weights = {
+            skill: weight * (1 + REPEAT_BONUS * (min(mentions[skill], MAX_MENTIONS) - 1))
+            for skill, weight in base.items()
+        }
+        return cls(weights, required)
+
+    @property
+    def skills(self):
+        return set(self.weights)
+
+    def match_percentage(self, bits):
+        """Weighted share of the JD's skills present in a skill bitset"""
+        if not self.total_weight:
+            return 0
+        matched = bits & self.skill_bits
+        weight = 0
+        while matched:
+            low = matched & -matched
+            weight += self._weight_by_id[low.bit_length() - 1]
+            matched ^= low
+        return round((weight / self.total_weight) * 100, 2)
+
+    def match(self, baseline):
+        """Copy of a baseline_ats_score result with this job's match added"""
+        warnings = list(baseline.warnings)
+        match_percentage = self.match_percentage(baseline.skill_bits)
 
-    return total, skills_found, missing_skills, warnings
+        if self.weights:
+            # Adjust warnings based on job match
+            if match_percentage < 50:
+                warnings.append(f"Your resume matches only {match_percentage}% of job requirements. Add more relevant skills.")
+            elif match_percentage < 75:
+                warnings.append(f"Good match ({match_percentage}%), but you could add more job-specific keywords.")
+            missing = skill_names(self.required_bits & ~baseline.skill_bits)
+            if missing:
+                warnings.append(f"Missing required skills: {', '.join(missing)}.")
+        else:
+            warnings.append("No specific skills found in job description.")
+
+        return ScanResult(baseline.score, baseline.skill_bits, warnings,
+                          baseline.components, baseline.word_count, match_percentage)
+
+    def score(self, resume_text):
+        """Baseline score plus job match for one resume"""
+        return self.match(baseline_ats_score(resume_text))
+
+    def to_dict(self):
+        return {"taxonomy_version": TAXONOMY_VERSION, "weights": self.weights,
+                "required": sorted(self.required)}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data["taxonomy_version"] != TAXONOMY_VERSION:
+            raise ValueError("Job profile was built for a different skill taxonomy")
+        return cls(data["weights"], data["required"])
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state["weights"], state["required"])
+
+
+# Compiled profiles by JD digest, so cached JDs don't stay in memory as keys
+PROFILE_CACHE_SIZE = 256
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+def compile_profile(job_description):
+    """JobProfile for a job description, cached by its SHA-256"""
+    key = hashlib.sha256(job_description.encode()).digest()
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+    with span("profile", bytes=len(job_description)):
+        profile = JobProfile.from_text(job_description)
+    with _profiles_lock:
+        _profiles[key] = profile
+        if len(_profiles) > PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
 
 # ---------- JOB MATCH SCORE ----------
+@traced("match")
 def job_match_score(resume_text, job_description):
     """Calculate ATS score with job description matching"""
-    # Get baseline score first
-    base_score, skills_found, missing_skills, warnings = baseline_ats_score(resume_text)
-    
-    # Extract skills from job description
-    jd_skills = extract_skills(job_description)
-    
-    # Calculate match percentage
-    if jd_skills:
-        matched_skills = skills_found.intersection(jd_skills)
-        match_percentage = (len(matched_skills) / len(jd_skills)) * 100
-        match_percentage = round(match_percentage, 2)
-        
-        # Adjust warnings based on job match
-        if match_percentage < 50:
-            warnings.append(f"Your resume matches only {match_percentage}% of job requirements. Add more relevant skills.")
-        elif match_percentage < 75:
-            warnings.append(f"Good match ({match_percentage}%), but you could add more job-specific keywords.")
-    else:
-        match_percentage = 0
-        warnings.append("No specific skills found in job description.")
-    
-    return base_score, skills_found, missing_skills, warnings, match_percentage
\ No newline at end of file
+    return compile_profile(job_description).score(resume_text)
+
+# ---------- BATCH SCORING ----------
+def score_batch(resumes, job_description=None, history=None):
+    """Score many (name, resume_text) pairs, parsing the job description once
+
+    Yields one result dict per resume, in input order. Each ScanResult is
+    also recorded in `history` (a history.ScanHistory) when one is given.
+    """
+    profile = compile_profile(job_description) if job_description else None
+
+    for name, resume_text in resumes:
+        if profile is None:
+            result = baseline_ats_score(resume_text)
+        else:
+            result = profile.score(resume_text)
+        if history is not None:
+            history.record(result, job_description=job_description)
+        yield result_dict(name, result)
+
+def result_dict(name, result):
+    """JSON-friendly dict for a ScanResult"""
+    return {
+        "name": name,
+        "score": result.score,
+        "match_percentage": result.match_percentage,
+        "skills_found": sorted(result.skills_found),
+        "missing_skills": result.missing_count,
+        "warnings": result.warnings,
+        "components": result.components._asdict(),
+    }
@@ -0,0 +1,155 @@
+import argparse
+import itertools
+import os
+import sys
+
+from ats_engine import score_batch
+from ingest import parse_files, DEFAULT_TIMEOUT
+from archive import is_archive, iter_members
+from report import write_report
+from ranking import rank_key, top_k, ResultStore
+from history import ScanHistory
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+# ---------- FILE DISCOVERY ----------
+def find_resumes(directory):
+    """Yield resume file paths under a directory, sorted for stable output"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                yield os.path.join(root, name)
+
+def is_resume_member(name):
+    """Resume-like archive member, skipping macOS resource forks"""
+    base = os.path.basename(name)
+    return (name.lower().endswith(RESUME_EXTENSIONS)
+            and not name.startswith("__MACOSX/") and not base.startswith("._"))
+
+def find_sources(path):
+    """Resume files in a directory, or members of a ZIP/tar archive"""
+    if is_archive(path):
+        return iter_members(path, select=is_resume_member)
+    return find_resumes(path)
+
+# ---------- RANKING ----------
+def score_directory(directory, job_description=None, errors=None,
+                    workers=None, timeout=DEFAULT_TIMEOUT, dedup=None, top=None, store=None,
+                    history=None):
+    """Parse and score every resume in a directory or archive, returning ranked results
+
+    Parsing is fanned out over `workers` processes; archive members are read
+    in place from a memory map rather than extracted. Files that fail to
+    parse are skipped and recorded in `errors` as (path, message) pairs when
+    a list is given.
+
+    Pass a dedup.NearDuplicateIndex as `dedup` to score only one resume per
+    cluster of near-duplicates; the others are listed in its "duplicates"
+    and left out of the ranking.
+
+    With `top`, only the best `top` results are kept (in a bounded heap)
+    and returned. A ranking.ResultStore given as `store` receives every
+    result as it is scored, for paging through later, and a
+    history.ScanHistory given as `history` logs every scan.
+    """
+    def texts():
+        for source, text, error in parse_files(find_sources(directory), workers, timeout):
+            if error is not None:
+                if errors is not None:
+                    errors.append((str(source), error))
+                continue
+            if dedup is not None and dedup.add(str(source), text) is not None:
+                continue
+            yield str(source), text
+
+    results = score_batch(texts(), job_description, history)
+    if store is not None:
+        results = store.tee(results, job_description)
+    if top is not None:
+        results = top_k(results, top)
+    else:
+        results = sorted(results, key=rank_key)
+    for rank, result in enumerate(results, 1):
+        result["rank"] = rank
+        if dedup is not None:
+            result["duplicates"] = dedup.duplicates_of(result["name"])
+    return results
+
+# ---------- CLI ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a directory or archive of resumes (PDF / DOCX) and write ranked results."
+    )
+    parser.add_argument("directory", help="Directory or ZIP/tar archive containing resumes")
+    parser.add_argument("-j", "--job-description", help="Path to a job description text file")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl", "txt"],
+                        help="Output format (default: from output extension, else csv)")
+    parser.add_argument("-w", "--workers", type=int,
+                        help="Parser processes (default: one per CPU)")
+    parser.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds allowed per file (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--dedup", nargs="?", type=float, const=0.8, metavar="THRESHOLD",
+                        help="Score near-duplicate resumes once (MinHash similarity, default 0.8)")
+    parser.add_argument("-k", "--top", type=int,
+                        help="Only output the best K resumes")
+    parser.add_argument("--store",
+                        help="Also save every result to this SQLite file for paging")
+    parser.add_argument("--history", default=os.environ.get("ATS_HISTORY_PATH"),
+                        help="Log every scan to this SQLite scan history"
+                             " (default: $ATS_HISTORY_PATH, if set)")
+    args = parser.parse_args(argv)
+
+    job_description = None
+    if args.job_description:
+        with open(args.job_description, encoding="utf-8") as f:
+            job_description = f.read()
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv"
+        if args.output and args.output.endswith((".jsonl", ".json")):
+            fmt = "jsonl"
+        elif args.output and args.output.endswith(".txt"):
+            fmt = "txt"
+
+    dedup = None
+    if args.dedup is not None:
+        # numpy is only needed when deduplicating
+        from dedup import NearDuplicateIndex
+        dedup = NearDuplicateIndex(args.dedup)
+
+    store = ResultStore(args.store) if args.store else None
+    history = ScanHistory(args.history) if args.history else None
+    errors = []
+    try:
+        scored = score_directory(args.directory, job_description, errors, args.workers,
+                                 args.timeout, dedup, args.top, store, history)
+    finally:
+        if store is not None:
+            store.close()
+        if history is not None:
+            history.close()
+    results = itertools.chain(
+        scored,
+        ({"name": name, "duplicate_of": result["name"]}
+         for result in scored for name in result.get("duplicates", [])),
+        ({"name": path, "error": message} for path, message in errors),
+    )
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        write_report(results, out, fmt)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    for path, message in errors:
+        print(f"warning: could not read {path}: {message}", file=sys.stderr)
+
+    # Fail only when nothing could be scored at all
+    return 1 if errors and not scored else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
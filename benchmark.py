@@ -0,0 +1,329 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+from ats_engine import (
+    read_pdf, read_docx, clean, extract_skills,
+    baseline_ats_score, job_match_score, SKILL_MATCHER,
+)
+from matcher import tokenize
+import parsers
+import report
+
+# Resume sizes in words, and the share of words that are skills
+SIZES = {"short": 200, "medium": 600, "long": 2000}
+DENSITIES = {"sparse": 0.02, "dense": 0.10}
+
+FILLER = (
+    "led team delivered project improved performance designed built system "
+    "managed stakeholders reduced costs implemented features analyzed data "
+    "collaborated with engineers mentored developers owned roadmap shipped "
+    "product customers platform reliability scalable quality results"
+).split()
+
+SECTIONS = ["Experience", "Education", "Projects", "Skills", "Certifications"]
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with Python, Django, PostgreSQL, Docker, "
+    "Kubernetes and AWS experience. Familiarity with Terraform, Redis, CI/CD "
+    "and React is a plus."
+)
+
+# ---------- SYNTHETIC CORPUS ----------
+def make_resume_text(words, density, rng):
+    """Plain-text resume with section headings and a given skill density"""
+    lines = ["Jane Doe", "jane.doe@example.com | github.com/janedoe"]
+    per_section = max(1, words // len(SECTIONS))
+    for section in SECTIONS:
+        lines.append(section)
+        body = []
+        for _ in range(per_section):
+            if rng.random() < density:
+                body.append(rng.choice(SKILL_MATCHER.skills))
+            else:
+                body.append(rng.choice(FILLER))
+        # Wrap into short lines like a real resume
+        for start in range(0, len(body), 12):
+            lines.append("- " + " ".join(body[start:start + 12]))
+    return "\n".join(lines)
+
+def make_docx(text):
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(text, lines_per_page=50):
+    """Minimal multi-page PDF with one Helvetica text line per resume line"""
+    lines = [line.encode("latin-1", "replace").decode("latin-1") for line in text.split("\n")]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page in enumerate(pages):
+        ops = "BT /F1 10 Tf 14 TL 50 750 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(ops)} >>\nstream\n{ops}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode()
+    return bytes(out)
+
+def make_corpus(per_variant=5, seed=0):
+    """Synthetic resumes across every size x density, as text, DOCX and PDF"""
+    rng = random.Random(seed)
+    corpus = []
+    for size, words in SIZES.items():
+        for density_name, density in DENSITIES.items():
+            for i in range(per_variant):
+                text = make_resume_text(words, density, rng)
+                corpus.append({
+                    "name": f"{size}-{density_name}-{i}",
+                    "text": text,
+                    "docx": make_docx(text),
+                    "pdf": make_pdf(text),
+                })
+    return corpus
+
+# ---------- MEASUREMENT ----------
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def measure(fn, inputs, repeat=3):
+    """Latency percentiles, throughput and peak traced memory of fn over inputs"""
+    latencies = []
+    for _ in range(repeat):
+        for args in inputs:
+            start = time.perf_counter()
+            fn(*args)
+            latencies.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate pass; tracemalloc distorts timings
+    tracemalloc.start()
+    peak = 0
+    for args in inputs:
+        tracemalloc.reset_peak()
+        fn(*args)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 4),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 4),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 4),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def _pipeline(parser, data):
+    text = parser(io.BytesIO(data))
+    return job_match_score(text, JOB_DESCRIPTION)
+
+def _render(result):
+    # Cold: every chart and report is built, none served from the cache
+    report.clear_cache()
+    report.gauge_spec(result)
+    report.category_spec(result)
+    report.text_report(result, "-")
+    report.json_report(result, "resume")
+    report.csv_report(result, "resume")
+
+def run_benchmarks(corpus, repeat=3):
+    """Time each engine stage and the end-to-end pipelines over a corpus"""
+    texts = [(doc["text"],) for doc in corpus]
+    stages = {
+        "read_pdf": (lambda data: read_pdf(io.BytesIO(data)), [(doc["pdf"],) for doc in corpus]),
+        "read_docx": (lambda data: read_docx(io.BytesIO(data)), [(doc["docx"],) for doc in corpus]),
+        "clean": (clean, texts),
+        "tokenize": (tokenize, texts),
+        "extract_skills": (extract_skills, texts),
+        "baseline_ats_score": (baseline_ats_score, texts),
+        "job_match_score": (job_match_score, [(doc["text"], JOB_DESCRIPTION) for doc in corpus]),
+        "render_report": (_render, [(job_match_score(doc["text"], JOB_DESCRIPTION),) for doc in corpus]),
+        "pipeline_pdf": (_pipeline, [(read_pdf, doc["pdf"]) for doc in corpus]),
+        "pipeline_docx": (_pipeline, [(read_docx, doc["docx"]) for doc in corpus]),
+    }
+    return {name: measure(fn, inputs, repeat) for name, (fn, inputs) in stages.items()}
+
+def run_parser_benchmarks(corpus, repeat=3):
+    """Time every installed extraction backend on the same documents"""
+    results = {}
+    for fmt in ("pdf", "docx"):
+        inputs = [(doc[fmt],) for doc in corpus]
+        for name, backend in parsers.PARSERS[fmt]:
+            def extract(data, backend=backend):
+                return list(backend(io.BytesIO(data)))
+            try:
+                extract(*inputs[0])
+            except ImportError:
+                continue
+            results[f"{fmt}:{name}"] = measure(extract, inputs, repeat)
+    return results
+
+# ---------- IMPORT TIME ----------
+# Modules a headless worker imports, timed in fresh interpreters
+IMPORT_MODULES = ["ats_engine", "incremental", "cache", "index", "batch", "report"]
+
+# Third-party packages that should load only when actually used
+HEAVY_MODULES = ["PyPDF2", "docx", "numpy", "streamlit", "plotly", "aiohttp"]
+
+def measure_import(module, repeat=5):
+    """Cold import time of `module` (python -X importtime) and the heavy packages it loads"""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    latencies = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        # Lines are "import time: self [us] | cumulative [us] | package"
+        for line in proc.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                latencies.append(int(fields[1]) / 1e6)
+        loaded = proc.stdout.strip()
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "heavy": loaded.split(",") if loaded else [],
+    }
+
+def run_import_benchmarks(modules=IMPORT_MODULES, repeat=5):
+    return {module: measure_import(module, repeat) for module in modules}
+
+def print_import_table(results, out=sys.stdout):
+    header = f"{'module':<20}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}  heavy imports"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for name, r in results.items():
+        print(f"{name:<20}{r['calls']:>7}{r['p50_ms']:>10}{r['p95_ms']:>10}  "
+              f"{', '.join(r['heavy']) or '-'}", file=out)
+
+# ---------- BASELINES ----------
+def compare(results, baseline, threshold=0.25, metric="p50_ms"):
+    """List regressions where `metric` grew by more than `threshold` (a fraction)"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = current[metric] / previous[metric]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {metric} {previous[metric]} -> {current[metric]} (+{(ratio - 1) * 100:.0f}%)"
+            )
+        # Import results also list heavy packages; a new one is a regression
+        added = set(current.get("heavy", ())) - set(previous.get("heavy", ()))
+        if added:
+            regressions.append(f"{name}: now imports {', '.join(sorted(added))}")
+    return regressions
+
+def print_table(results, out=sys.stdout):
+    header = f"{'stage':<20}{'calls':>7}{'ops/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KB':>10}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for name, r in results.items():
+        print(f"{name:<20}{r['calls']:>7}{r['throughput_per_s']:>11}{r['p50_ms']:>10}"
+              f"{r['p95_ms']:>10}{r['p99_ms']:>10}{r['peak_kb']:>10}", file=out)
+
+# ---------- CLI ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ATS engine on a synthetic corpus.")
+    parser.add_argument("-n", "--per-variant", type=int, default=5,
+                        help="Resumes per size/density combination (default: 5)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timed passes (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write results as a JSON baseline")
+    parser.add_argument("-c", "--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed p50 slowdown before failing, as a fraction (default: 0.25)")
+    parser.add_argument("--imports", action="store_true",
+                        help="Also measure cold import time of the headless modules")
+    parser.add_argument("--parsers", action="store_true",
+                        help="Also compare every installed PDF/DOCX extraction backend")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.per_variant, args.seed)
+    results = run_benchmarks(corpus, args.repeat)
+    print_table(results)
+
+    backends = {}
+    if args.parsers:
+        backends = run_parser_benchmarks(corpus, args.repeat)
+        print()
+        print_table(backends)
+
+    imports = {}
+    if args.imports:
+        imports = run_import_benchmarks(repeat=max(args.repeat, 5))
+        print()
+        print_import_table(imports)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "corpus": {"per_variant": args.per_variant, "seed": args.seed},
+                "results": results,
+                "parsers": backends,
+                "imports": imports,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+        regressions += compare(backends, baseline.get("parsers", {}), args.threshold)
+        regressions += compare(imports, baseline.get("imports", {}), args.threshold)
+        if regressions:
+            print("\nRegressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
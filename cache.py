@@ -0,0 +1,261 @@
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from instrument import profile_document
+from parsers import detect_format, format_from_name, ViewIO, registry_version
+from ats_engine import (
+    read_document, baseline_ats_score, job_match_score,
+    ScanResult, ScoreComponents, TAXONOMY_VERSION, SCORING_VERSION,
+    MAX_PDF_PAGES, MAX_TEXT_CHARS,
+)
+
+# Share of max_entries the disk store evicts at once when it overflows
+EVICT_FRACTION = 0.05
+
+# Seconds a disk row's access time may lag; a hit on a fresher row writes nothing
+TOUCH_INTERVAL = 60.0
+
+# ---------- KEYS ----------
+def file_digest(data):
+    """SHA-256 of raw file bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+def extraction_version():
+    """Parser backends and extraction limits, which decide the text of a file"""
+    return f"{registry_version()}:{MAX_PDF_PAGES}.{MAX_TEXT_CHARS}"
+
+def text_key(digest):
+    """Text depends on the file, the parser backends and the extraction limits"""
+    return f"text:{digest}:{extraction_version()}"
+
+def score_key(digest, job_description=None):
+    """Scores depend on the file's text, the taxonomy, the scoring rules and the job description"""
+    jd = hashlib.sha256(job_description.encode()).hexdigest() if job_description else "-"
+    return f"score:{digest}:{extraction_version()}:{TAXONOMY_VERSION}.{SCORING_VERSION}:{jd}"
+
+# ---------- IN-MEMORY LRU ----------
+class LRUCache:
+    """Bounded least-recently-used map with hit/miss/eviction counters
+
+    Entries are limited both by count and by their approximate size in bytes.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self._data = OrderedDict()  # key -> (value, size)
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size):
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        if size > self.max_bytes:
+            return
+        self._data[key] = (value, size)
+        self.size += size
+        while len(self._data) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self.size = 0
+
+# ---------- ON-DISK STORE ----------
+class DiskStore:
+    """SQLite-backed key/value store that evicts least recently used rows
+
+    The row count is tracked as rows are written, and overflow is evicted
+    in batches of EVICT_FRACTION of the limit, so a write never counts or
+    scans the whole table. A hit only rewrites the access time once it is
+    TOUCH_INTERVAL old, so repeat reads are plain SELECTs.
+    """
+
+    def __init__(self, path, max_entries=100_000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __len__(self):
+        return self._count
+
+    def get(self, key):
+        row = self._conn.execute(
+            "SELECT value, accessed FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] >= TOUCH_INTERVAL:
+            self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[0]
+
+    def put(self, key, value):
+        exists = self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, accessed) VALUES (?, ?, ?)",
+            (key, value, time.time()),
+        )
+        if exists is None:
+            self._count += 1
+        if self._count > self.max_entries:
+            evict = self._count - self.max_entries + int(self.max_entries * EVICT_FRACTION)
+            deleted = self._conn.execute(
+                "DELETE FROM cache WHERE key IN"
+                " (SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+                (evict,),
+            ).rowcount
+            self._count -= deleted
+            self.evictions += deleted
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM cache")
+        self._conn.commit()
+        self._count = 0
+
+    def close(self):
+        self._conn.close()
+
+# ---------- SCAN CACHE ----------
+class ScanCache:
+    """Two-level cache for extracted resume text and scoring results
+
+    Values must be JSON-serializable. The in-memory LRU is consulted first,
+    then the optional on-disk store, whose hits are promoted back into memory.
+    """
+
+    def __init__(self, path=None, max_entries=1024, max_bytes=64 * 1024 * 1024,
+                 max_disk_entries=100_000):
+        self.memory = LRUCache(max_entries, max_bytes)
+        self.disk = DiskStore(path, max_disk_entries) if path else None
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self.memory.get(key)
+            if value is None and self.disk is not None:
+                raw = self.disk.get(key)
+                if raw is not None:
+                    value = json.loads(raw)
+                    self.memory.put(key, value, len(raw))
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        raw = json.dumps(value)
+        with self._lock:
+            self.memory.put(key, value, len(raw))
+            if self.disk is not None:
+                self.disk.put(key, raw)
+
+    def stats(self):
+        """Hit/miss/eviction counters and current sizes"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory.size,
+                "memory_evictions": self.memory.evictions,
+                "disk_entries": len(self.disk) if self.disk is not None else 0,
+                "disk_evictions": self.disk.evictions if self.disk is not None else 0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            if self.disk is not None:
+                self.disk.clear()
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+
+# ---------- CACHED SCAN ----------
+def _encode_score(result):
+    # Skill bits are only meaningful for one taxonomy, which the key pins
+    return {"score": result.score, "skill_bits": result.skill_bits,
+            "warnings": result.warnings, "components": list(result.components),
+            "word_count": result.word_count, "match_percentage": result.match_percentage}
+
+def _decode_score(value):
+    return ScanResult(value["score"], value["skill_bits"], list(value["warnings"]),
+                      ScoreComponents(*value["components"]), value["word_count"],
+                      value["match_percentage"])
+
+def read_resume_bytes(data, filename, cache=None, digest=None):
+    """Extract text from PDF/DOCX bytes, reusing cached text for known files
+
+    `data` may be any buffer (bytes, memoryview, mmap slice); it is read
+    in place, not copied.
+    """
+    key = text_key(digest or file_digest(data))
+    if cache is not None:
+        text = cache.get(key)
+        if text is not None:
+            return text
+
+    # Format comes from the content; the name only breaks ties
+    fmt = detect_format(data) or format_from_name(filename)
+    text = read_document(ViewIO(data), fmt)
+
+    if cache is not None:
+        cache.put(key, text)
+    return text
+
+def scan_resume(data, filename, job_description=None, cache=None):
+    """Parse and score a resume file, skipping work already cached
+
+    Returns (resume_text, result) where result is the ScanResult returned
+    by baseline_ats_score or job_match_score.
+    """
+    digest = file_digest(data)
+    with profile_document(filename):
+        resume_text = read_resume_bytes(data, filename, cache, digest)
+
+        key = score_key(digest, job_description)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            return resume_text, _decode_score(cached)
+
+        if job_description:
+            result = job_match_score(resume_text, job_description)
+        else:
+            result = baseline_ats_score(resume_text)
+
+    if cache is not None:
+        cache.put(key, _encode_score(result))
+    return resume_text, result
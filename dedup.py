@@ -0,0 +1,111 @@
+import zlib
+
+import numpy as np
+
+from ats_engine import clean
+
+# Signature length, and how it is split into LSH bands of equal rows.
+# 8 bands x 8 rows makes pairs above ~0.77 Jaccard similarity likely to
+# share a bucket; candidates are then checked against THRESHOLD.
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+# Words per shingle, and the estimated Jaccard similarity that counts as a
+# near-duplicate
+SHINGLE_WORDS = 5
+THRESHOLD = 0.8
+
+# Resumes with fewer shingles (little or no extracted text, e.g. scanned
+# PDFs) say too little to be anyone's duplicate and are never clustered
+MIN_SHINGLES = 10
+
+# Universal hashing h(x) = (a * x + b) mod p; with x < 2**32 and a, b < p
+# every product fits in 64 bits
+PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240101)
+_A = _rng.integers(1, PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, PRIME, NUM_PERM, dtype=np.uint64)
+
+
+# ---------- SIGNATURES ----------
+def shingles(text, k=SHINGLE_WORDS):
+    """CRC32 hashes of the k-word shingles of clean(text)"""
+    words = clean(text).split()
+    if len(words) < k:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64)
+
+def minhash(text):
+    """MinHash signature (NUM_PERM uint32 values) of a resume's shingles
+
+    None if the text has no shingles at all.
+    """
+    return signature_of(shingles(text))
+
+def signature_of(hashes):
+    """MinHash signature of shingle hashes, or None if there are none"""
+    if not len(hashes):
+        return None
+    # (NUM_PERM, n_shingles) -> minimum per permutation
+    permuted = (np.outer(_A, hashes) + _B[:, np.newaxis]) % PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+# ---------- CLUSTERING ----------
+class NearDuplicateIndex:
+    """LSH index grouping near-duplicate resumes around the first one seen
+
+    Only cluster representatives are kept in the buckets, so each lookup
+    compares a signature with a handful of candidates no matter how many
+    resumes have been added.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.clusters = {}      # representative -> [duplicate names]
+        self._signatures = {}   # representative -> signature
+        self._buckets = {}      # (band, rows bytes) -> [representatives]
+
+    def add(self, name, text):
+        """Index a resume; returns the representative it duplicates, or None
+
+        Resumes with fewer than MIN_SHINGLES shingles are not indexed, so
+        text-less files are never merged into one cluster.
+        """
+        hashes = shingles(text)
+        if len(hashes) < MIN_SHINGLES:
+            return None
+        signature = signature_of(hashes)
+        keys = [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes())
+                for band in range(BANDS)]
+
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for key in keys:
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = similarity(signature, self._signatures[candidate])
+                if score >= best_similarity:
+                    best, best_similarity = candidate, score
+
+        if best is not None:
+            self.clusters[best].append(name)
+            return best
+
+        self.clusters[name] = []
+        self._signatures[name] = signature
+        for key in keys:
+            self._buckets.setdefault(key, []).append(name)
+        return None
+
+    def duplicates_of(self, name):
+        return self.clusters.get(name, [])
@@ -0,0 +1,253 @@
+import atexit
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from ats_engine import ALL_SKILL_BITS, TAXONOMY_VERSION, compile_profile, skill_names
+
+# Buffered scans are written in one transaction once this many are waiting,
+# or when the oldest has waited FLUSH_INTERVAL seconds
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 2.0
+
+# Score histogram: ten buckets of ten points, 100 falls in the last one
+BUCKETS = 10
+
+# Aggregate row covering every scan, whatever the job description
+ALL = "*"
+NO_JOB = "-"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    scanned REAL NOT NULL,
+    day TEXT NOT NULL,
+    digest TEXT,
+    jd TEXT NOT NULL,
+    taxonomy TEXT NOT NULL,
+    score REAL NOT NULL,
+    match_percentage REAL,
+    skills REAL, sections REAL, length REAL, format REAL,
+    word_count INTEGER,
+    skill_bits BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    jd TEXT PRIMARY KEY,
+    scans INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    matched INTEGER NOT NULL,
+    match_sum REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS histogram (
+    jd TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    scans INTEGER NOT NULL,
+    PRIMARY KEY (jd, bucket)
+);
+CREATE TABLE IF NOT EXISTS missing (
+    jd TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    scans INTEGER NOT NULL,
+    PRIMARY KEY (jd, skill)
+);
+CREATE INDEX IF NOT EXISTS missing_top ON missing (jd, scans DESC);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    scans INTEGER NOT NULL
+);
+"""
+
+
+# ---------- KEYS ----------
+def jd_key(job_description=None):
+    """Aggregates are kept per job description, by its SHA-256"""
+    if not job_description:
+        return NO_JOB
+    return hashlib.sha256(job_description.encode()).hexdigest()
+
+def bucket_of(score):
+    return min(int(score // (100 / BUCKETS)), BUCKETS - 1)
+
+def _bits_blob(bits):
+    return bits.to_bytes((ALL_SKILL_BITS.bit_length() + 7) // 8, "little")
+
+
+def _aggregate(pending):
+    """Per job description counters of buffered (row, missing bits) pairs
+
+    Returns totals {jd: (scans, score sum, matched, match sum)} and
+    Counters of (jd, bucket), (jd, skill) and day.
+    """
+    totals = {}
+    histogram = Counter()
+    missing = Counter()
+    daily = Counter()
+    for row, missing_bits in pending:
+        jd, score, match = row[3], row[5], row[6]
+        names = skill_names(missing_bits)
+        daily[row[1]] += 1
+        for key in (ALL, jd):
+            scans, score_sum, matched, match_sum = totals.get(key, (0, 0.0, 0, 0.0))
+            totals[key] = (scans + 1, score_sum + score,
+                           matched + (match is not None), match_sum + (match or 0))
+            histogram[key, bucket_of(score)] += 1
+            missing.update((key, name) for name in names)
+    return totals, histogram, missing, daily
+
+
+# ---------- HISTORY STORE ----------
+class ScanHistory:
+    """Append-only log of scan results with running aggregates
+
+    Results are buffered and inserted in batches into a SQLite database in
+    WAL mode. Each batch also bumps per job description counters (scans,
+    score sums, a score histogram, missing skill counts) in the same
+    transaction, so summary() reads a few small rows instead of scanning
+    the log.
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        atexit.register(self.close)
+
+    def record(self, result, digest=None, job_description=None):
+        """Queue a ScanResult for the log"""
+        now = time.time()
+        jd = jd_key(job_description)
+        if job_description:
+            # Only skills the job asks for count as missing
+            missing = compile_profile(job_description).skill_bits & ~result.skill_bits
+        else:
+            missing = ALL_SKILL_BITS & ~result.skill_bits
+        row = (now, time.strftime("%Y-%m-%d", time.localtime(now)), digest, jd,
+               TAXONOMY_VERSION, result.score, result.match_percentage,
+               *result.components, result.word_count, _bits_blob(result.skill_bits))
+
+        with self._lock:
+            self._pending.append((row, missing))
+            if self._oldest is None:
+                self._oldest = now
+            if (len(self._pending) >= self.batch_size
+                    or now - self._oldest >= self.flush_interval):
+                self._flush()
+
+    def flush(self):
+        """Write buffered scans now"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending, self._oldest = self._pending, [], None
+        totals, histogram, missing, daily = _aggregate(pending)
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO scans (scanned, day, digest, jd, taxonomy, score,"
+                " match_percentage, skills, sections, length, format, word_count,"
+                " skill_bits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [row for row, _ in pending],
+            )
+            self._conn.executemany(
+                "INSERT INTO totals VALUES (?, ?, ?, ?, ?) ON CONFLICT (jd) DO UPDATE SET"
+                " scans = scans + excluded.scans, score_sum = score_sum + excluded.score_sum,"
+                " matched = matched + excluded.matched, match_sum = match_sum + excluded.match_sum",
+                [(key, *values) for key, values in totals.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO histogram VALUES (?, ?, ?) ON CONFLICT (jd, bucket)"
+                " DO UPDATE SET scans = scans + excluded.scans",
+                [(*key, count) for key, count in histogram.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO missing VALUES (?, ?, ?) ON CONFLICT (jd, skill)"
+                " DO UPDATE SET scans = scans + excluded.scans",
+                [(*key, count) for key, count in missing.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO daily VALUES (?, ?) ON CONFLICT (day)"
+                " DO UPDATE SET scans = scans + excluded.scans",
+                list(daily.items()),
+            )
+
+    # ---------- AGGREGATES ----------
+    def summary(self, job_description=None, top=10, all_jobs=False):
+        """Scan count, average scores, score histogram and most-missing skills
+
+        Covers scans against one job description (none: baseline scans), or
+        every scan when `all_jobs` is set. Reads only aggregate rows, plus
+        the buffered scans, which are counted in memory rather than flushed.
+        """
+        key = ALL if all_jobs else jd_key(job_description)
+        with self._lock:
+            totals, pending_histogram, pending_missing, _ = _aggregate(self._pending)
+            row = self._conn.execute(
+                "SELECT scans, score_sum, matched, match_sum FROM totals WHERE jd = ?", (key,)
+            ).fetchone()
+            histogram = [0] * BUCKETS
+            for bucket, scans in self._conn.execute(
+                    "SELECT bucket, scans FROM histogram WHERE jd = ?", (key,)):
+                histogram[bucket] = scans
+            stored = dict(self._conn.execute(
+                "SELECT skill, scans FROM missing WHERE jd = ? ORDER BY scans DESC, skill LIMIT ?",
+                (key, top),
+            ))
+            # Buffered skills outside the stored top may still overtake it
+            buffered = Counter({skill: scans for (jd, skill), scans in pending_missing.items()
+                                if jd == key})
+            if buffered:
+                stored.update(self._conn.execute(
+                    f"SELECT skill, scans FROM missing WHERE jd = ? AND skill IN"
+                    f" ({', '.join('?' * len(buffered))})", (key, *buffered),
+                ))
+
+        for (jd, bucket), scans in pending_histogram.items():
+            if jd == key:
+                histogram[bucket] += scans
+        missing = buffered + Counter(stored)
+        most_missing = sorted(missing.items(), key=lambda item: (-item[1], item[0]))[:top]
+
+        scans, score_sum, matched, match_sum = row or (0, 0.0, 0, 0.0)
+        if key in totals:
+            scans, score_sum, matched, match_sum = (
+                a + b for a, b in zip((scans, score_sum, matched, match_sum), totals[key]))
+        return {
+            "scans": scans,
+            "average_score": round(score_sum / scans, 2) if scans else None,
+            "average_match": round(match_sum / matched, 2) if matched else None,
+            "histogram": histogram,
+            "most_missing": most_missing,
+        }
+
+    def scan_counts(self):
+        """(all scans, scans today), including buffered ones without flushing"""
+        today = time.strftime("%Y-%m-%d")
+        with self._lock:
+            pending = len(self._pending)
+            pending_today = sum(1 for row, _ in self._pending if row[1] == today)
+            total = self._conn.execute(
+                "SELECT scans FROM totals WHERE jd = ?", (ALL,)).fetchone()
+            day = self._conn.execute(
+                "SELECT scans FROM daily WHERE day = ?", (today,)).fetchone()
+        return (total[0] if total else 0) + pending, (day[0] if day else 0) + pending_today
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush()
+            self._conn.close()
+            self._conn = None
+        atexit.unregister(self.close)
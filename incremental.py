@@ -0,0 +1,118 @@
+from parsers import detect_format, format_from_name, ViewIO
+from ats_engine import (
+    iter_pdf_pages, iter_docx_paragraphs, compile_profile,
+    score_tokens, SKILL_MATCHER,
+)
+from matcher import tokenize, CHUNK_RE
+
+# Words on each side of a segment boundary that a multi-word skill can span
+EDGE_WORDS = SKILL_MATCHER.max_words - 1
+
+
+# ---------- SEGMENTS ----------
+def read_segments(data, filename):
+    """Pages of a PDF or paragraphs of a DOCX, from raw upload bytes"""
+    fmt = detect_format(data) or format_from_name(filename)
+    if fmt == "pdf":
+        return list(iter_pdf_pages(ViewIO(data)))
+    if fmt == "docx":
+        return list(iter_docx_paragraphs(ViewIO(data)))
+    raise ValueError("Unsupported file type; expected a PDF or DOCX file")
+
+
+class _Segment:
+    """Tokens, skills and boundary words of one paragraph or page"""
+
+    __slots__ = ("stream", "skills", "head", "tail", "edge_words")
+
+    def __init__(self, text):
+        self.stream = tokenize(text)
+        self.skills = SKILL_MATCHER.find_tokens(self.stream)
+
+        # Leading and trailing words, whitespace kept, for boundary matches.
+        # A segment of at most EDGE_WORDS words is its own head and tail, so
+        # a skill can run on through it into the next one.
+        chunks = list(CHUNK_RE.finditer(text)) if EDGE_WORDS else []
+        self.edge_words = min(len(chunks), EDGE_WORDS)
+        if len(chunks) > EDGE_WORDS:
+            self.head = text[:chunks[EDGE_WORDS - 1].end()]
+            self.tail = text[chunks[-EDGE_WORDS].start():]
+        else:
+            self.head = self.tail = text
+
+
+class _Combined:
+    """TokenStream-like view over the segments of one resume version"""
+
+    __slots__ = ("streams", "word_count", "symbols", "has_email")
+
+    def __init__(self, streams):
+        self.streams = streams
+        self.word_count = sum(s.word_count for s in streams)
+        self.symbols = set().union(*(s.symbols for s in streams))
+        self.has_email = any(s.has_email for s in streams)
+
+    def mentions(self, prefix):
+        return any(s.mentions(prefix) for s in self.streams)
+
+
+# ---------- INCREMENTAL SCORER ----------
+class IncrementalScorer:
+    """Re-score successive versions of one resume, redoing only what changed
+
+    Segments (paragraphs or pages) are scored as if joined with single
+    spaces, as read_docx joins paragraphs, so results equal
+    baseline_ats_score / job_match_score on " ".join(segments). Segments
+    and boundaries are keyed by content: an edited bullet is re-tokenized,
+    while unchanged, moved or duplicated ones are reused.
+    """
+
+    def __init__(self):
+        self._segments = {}    # text -> _Segment
+        self._boundaries = {}  # (tail, head) -> skills spanning the boundary
+        # Segments tokenized by the last score() call
+        self.recomputed = 0
+
+    def score(self, segments, job_description=None):
+        """Score the latest version; returns a ScanResult"""
+        previous, previous_boundaries = self._segments, self._boundaries
+        current, boundaries = {}, {}
+        states = []
+        self.recomputed = 0
+
+        for text in segments:
+            state = current.get(text) or previous.get(text)
+            if state is None:
+                state = _Segment(text)
+                self.recomputed += 1
+            current[text] = state
+            states.append(state)
+
+        skills_found = set().union(*(s.skills for s in states))
+        for i, left in enumerate(states[:-1]):
+            if not left.edge_words:
+                continue
+            # A skill crossing this boundary has at most EDGE_WORDS words
+            # after it, possibly spread over several short segments
+            heads, words = [], 0
+            for right in states[i + 1:]:
+                heads.append(right.head)
+                words += right.edge_words
+                if words >= EDGE_WORDS:
+                    break
+            key = (left.tail, " ".join(heads))
+            if not words or key in boundaries:
+                continue
+            found = previous_boundaries.get(key)
+            if found is None:
+                found = SKILL_MATCHER.find(key[0] + " " + key[1])
+            boundaries[key] = found
+            skills_found |= found
+
+        # Only the latest version's state is kept
+        self._segments, self._boundaries = current, boundaries
+
+        result = score_tokens(_Combined([s.stream for s in states]), skills_found)
+        if not job_description:
+            return result
+        return compile_profile(job_description).match(result)
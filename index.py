@@ -0,0 +1,189 @@
+import sys
+import json
+import heapq
+import base64
+from array import array
+from collections import Counter
+from bisect import bisect_left
+
+from ats_engine import extract_skills, SKILL_MATCHER, TAXONOMY_VERSION
+
+
+def _pack(ids):
+    """Encode a doc-id array as little-endian base64"""
+    if sys.byteorder == "big":
+        ids = array("I", ids)
+        ids.byteswap()
+    return base64.b64encode(ids.tobytes()).decode("ascii")
+
+def _unpack(data):
+    ids = array("I")
+    ids.frombytes(base64.b64decode(data))
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
+
+# ---------- SKILL INDEX ----------
+class SkillIndex:
+    """Inverted skill -> resume index over a corpus
+
+    Every skill in the taxonomy has a posting list: a sorted array of
+    integer document IDs. IDs are handed out in increasing order and never
+    reused, so adding a document only appends to its postings.
+    """
+
+    def __init__(self):
+        self.skills = SKILL_MATCHER.skills
+        self._skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+        self._postings = [array("I") for _ in self.skills]
+        self._names = {}      # doc id -> name
+        self._doc_ids = {}    # name -> doc id
+        self._doc_skills = {}  # doc id -> array of skill ids
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._doc_ids
+
+    # ---- Updates ----
+    def add(self, name, resume_text):
+        """Index a resume's skills under `name`, replacing any previous version"""
+        self.add_skills(name, extract_skills(resume_text))
+
+    def add_skills(self, name, skills):
+        """Index an already extracted skill set"""
+        if name in self._doc_ids:
+            self.remove(name)
+
+        doc_id = self._next_id
+        self._next_id += 1
+        skill_ids = array("I", sorted(self._skill_ids[s] for s in skills if s in self._skill_ids))
+        for skill_id in skill_ids:
+            self._postings[skill_id].append(doc_id)
+
+        self._names[doc_id] = name
+        self._doc_ids[name] = doc_id
+        self._doc_skills[doc_id] = skill_ids
+
+    def remove(self, name):
+        """Drop a document from the index"""
+        doc_id = self._doc_ids.pop(name)
+        del self._names[doc_id]
+        for skill_id in self._doc_skills.pop(doc_id):
+            posting = self._postings[skill_id]
+            del posting[bisect_left(posting, doc_id)]
+
+    def skills_of(self, name):
+        """Skills indexed for a document"""
+        return {self.skills[i] for i in self._doc_skills[self._doc_ids[name]]}
+
+    # ---- Queries ----
+    def posting(self, skill):
+        """Sorted doc IDs having `skill` (empty for unknown skills)"""
+        skill_id = self._skill_ids.get(skill)
+        return self._postings[skill_id] if skill_id is not None else array("I")
+
+    def query(self, all_of=(), any_of=(), none_of=()):
+        """Names of documents with every skill in all_of, at least one of
+        any_of (if given) and none of none_of, in indexing order"""
+        return [self._names[doc_id] for doc_id in self._match(all_of, any_of, none_of)]
+
+    def _match(self, all_of=(), any_of=(), none_of=()):
+        """Sorted doc IDs satisfying a boolean skill query"""
+        required = sorted((self.posting(s) for s in all_of), key=len)
+
+        if required:
+            # Start from the rarest skill to keep the working set small
+            result = set(required[0])
+            for posting in required[1:]:
+                if not result:
+                    break
+                result.intersection_update(posting)
+        elif any_of:
+            result = None
+        else:
+            result = set(self._names)
+
+        if any_of:
+            alternatives = set()
+            for skill in any_of:
+                alternatives.update(self.posting(skill))
+            result = alternatives if result is None else result & alternatives
+
+        for skill in none_of:
+            if not result:
+                break
+            result.difference_update(self.posting(skill))
+
+        return sorted(result)
+
+    def top_k(self, job_description, k=10, all_of=(), any_of=(), none_of=()):
+        """Best k documents by unweighted skill overlap with a job description
+
+        `job_description` may be raw text or an already extracted skill set.
+        Returns (name, match_percentage) pairs, best first; an optional
+        boolean filter restricts the candidates.
+        """
+        if isinstance(job_description, str):
+            jd_skills = extract_skills(job_description)
+        else:
+            jd_skills = set(job_description)
+        jd_skills = [s for s in jd_skills if s in self._skill_ids]
+        if not jd_skills:
+            return []
+
+        # Count overlaps by walking only the JD skills' postings
+        counts = Counter()
+        for skill in jd_skills:
+            counts.update(self.posting(skill))
+
+        if all_of or any_of or none_of:
+            allowed = set(self._match(all_of, any_of, none_of))
+            counts = {doc_id: n for doc_id, n in counts.items() if doc_id in allowed}
+
+        best = heapq.nsmallest(k, counts.items(), key=lambda item: (-item[1], item[0]))
+        total = len(jd_skills)
+        return [(self._names[doc_id], round(n / total * 100, 2)) for doc_id, n in best]
+
+    # ---- Persistence ----
+    def save(self, path):
+        """Write the index to a JSON file"""
+        data = {
+            "taxonomy_version": TAXONOMY_VERSION,
+            "skills": self.skills,
+            "next_id": self._next_id,
+            "docs": [[doc_id, name] for doc_id, name in self._names.items()],
+            "postings": [_pack(posting) for posting in self._postings],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()
+
+        Raises ValueError if it was built with a different taxonomy.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        index = cls()
+        if data["taxonomy_version"] != TAXONOMY_VERSION or data["skills"] != index.skills:
+            raise ValueError("Index was built with a different skill taxonomy; rebuild it.")
+
+        index._next_id = data["next_id"]
+        for doc_id, name in data["docs"]:
+            index._names[doc_id] = name
+            index._doc_ids[name] = doc_id
+
+        doc_skills = {doc_id: array("I") for doc_id in index._names}
+        for skill_id, packed in enumerate(data["postings"]):
+            posting = _unpack(packed)
+            index._postings[skill_id] = posting
+            for doc_id in posting:
+                doc_skills[doc_id].append(skill_id)
+        index._doc_skills = doc_skills
+        return index
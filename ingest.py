@@ -0,0 +1,198 @@
+import os
+import signal
+import time
+import threading
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from ats_engine import read_document
+from archive import ArchiveMember, member_data
+from parsers import detect_format, format_from_name, ViewIO
+from instrument import profile_document
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Seconds a single document may spend in a parser
+DEFAULT_TIMEOUT = 30
+
+# Extra time the parent waits before killing a worker that ignored its alarm
+KILL_GRACE = 5
+
+# Finished results held back per worker while an earlier file is still running
+REORDER_WINDOW = 8
+
+ParseResult = namedtuple("ParseResult", "path text error")
+
+
+class ParseTimeout(Exception):
+    """Raised inside a worker when a document exceeds its time budget"""
+
+
+# ---------- SINGLE FILE ----------
+def read_resume(source):
+    """Extract text from a PDF or DOCX file on disk or an ArchiveMember
+
+    The format is detected from the file's leading bytes.
+    """
+    if isinstance(source, ArchiveMember):
+        data = member_data(source)
+        return read_document(ViewIO(data), detect_format(data) or format_from_name(source.name))
+
+    with open(source, "rb") as f:
+        head = f.read(1024)
+    return read_document(source, detect_format(head) or format_from_name(source))
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout("parsing timed out")
+
+@contextmanager
+def time_limit(seconds):
+    """Raise ParseTimeout in the current process after `seconds`
+
+    Uses SIGALRM, so it only takes effect in a process's main thread on
+    platforms that have it; elsewhere it is a no-op.
+    """
+    use_alarm = (seconds and hasattr(signal, "SIGALRM")
+                 and threading.current_thread() is threading.main_thread())
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _parse_worker(source, timeout):
+    """Parse one file inside a worker, interrupting it after `timeout` seconds"""
+    with time_limit(timeout), profile_document(str(source)):
+        return read_resume(source)
+
+def _init_worker(memory_limit):
+    """Cap worker address space so a hostile file can't exhaust the host"""
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+# ---------- POOL ----------
+def _new_pool(workers, memory_limit):
+    return ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(memory_limit,))
+
+def _terminate(pool):
+    """Shut a pool down without waiting on hung workers"""
+    # ProcessPoolExecutor has no public way to kill workers before 3.14
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+def _error_message(exc):
+    return str(exc) or type(exc).__name__
+
+def parse_files(paths, workers=None, timeout=DEFAULT_TIMEOUT, memory_limit=None):
+    """Parse PDF/DOCX files across a process pool
+
+    `paths` may mix file paths and ArchiveMembers and is consumed lazily,
+    so a large archive is never listed or held in memory all at once.
+    Yields a ParseResult(path, text, error) per path, in input order. A file
+    that raises, times out or crashes its worker gets an error message and
+    never takes the rest of the batch down with it.
+    """
+    workers = workers or os.cpu_count() or 1
+    hard_timeout = timeout + KILL_GRACE if timeout else None
+
+    sources = enumerate(paths)
+    exhausted = False
+    # Files taken from `sources` whose result hasn't been yielded yet
+    pending = {}
+    # Files whose worker died alongside others; rerun alone to find the culprit
+    suspects = deque()
+    # Files killed with a pool for another file's timeout; rerun as usual
+    retry = deque()
+    running = {}  # future -> (index, deadline, solo)
+    finished = {}  # index -> ParseResult, held until earlier files are done
+    next_index = 0
+    pool = None
+
+    def take():
+        nonlocal exhausted
+        for index, source in sources:
+            pending[index] = source
+            return index
+        exhausted = True
+        return None
+
+    def submit(index, solo):
+        deadline = time.monotonic() + hard_timeout if hard_timeout else None
+        future = pool.submit(_parse_worker, pending[index], timeout)
+        running[future] = (index, deadline, solo)
+
+    try:
+        while not exhausted or suspects or retry or running:
+            if pool is None:
+                pool = _new_pool(workers, memory_limit)
+
+            if suspects:
+                if not running:
+                    submit(suspects.popleft(), solo=True)
+            else:
+                # Earlier results wait on these, so they skip the read-ahead limit
+                while len(running) < workers and retry:
+                    submit(retry.popleft(), solo=False)
+                # Stop reading ahead while too many results wait on a slow file
+                while (len(running) < workers and not exhausted
+                       and len(finished) < workers * REORDER_WINDOW):
+                    index = take()
+                    if index is not None:
+                        submit(index, solo=False)
+
+            deadlines = [d for _, d, _ in running.values() if d is not None]
+            wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            crashed = timed_out = False
+            for future in done:
+                index, _, solo = running.pop(future)
+                try:
+                    finished[index] = ParseResult(pending[index], future.result(), None)
+                except BrokenProcessPool:
+                    crashed = True
+                    if solo:
+                        finished[index] = ParseResult(pending[index], None, "worker process crashed")
+                    else:
+                        suspects.append(index)
+                except Exception as exc:
+                    finished[index] = ParseResult(pending[index], None, _error_message(exc))
+
+            now = time.monotonic()
+            for future, (index, deadline, _) in list(running.items()):
+                if deadline is not None and deadline <= now:
+                    del running[future]
+                    finished[index] = ParseResult(pending[index], None, f"timed out after {timeout}s")
+                    timed_out = True
+
+            if crashed or timed_out:
+                # Whatever was still in flight dies with the pool. After a
+                # crash any of it may be the cause; a timeout names its file.
+                in_flight = [index for index, _, _ in running.values()]
+                (suspects if crashed else retry).extend(in_flight)
+                running.clear()
+                _terminate(pool)
+                pool = None
+
+            while next_index in finished:
+                del pending[next_index]
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        if pool is not None:
+            if running:
+                _terminate(pool)
+            else:
+                pool.shutdown()
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import logging
+import cProfile
+import threading
+import functools
+from contextlib import contextmanager
+
+logger = logging.getLogger("ats.instrument")
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+_state = threading.local()
+_enabled = os.environ.get("ATS_INSTRUMENT", "").lower() in ("1", "true", "yes")
+_lock = threading.Lock()
+_metrics = {}  # stage -> _StageMetrics
+
+
+def enable():
+    """Start recording spans"""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Stop recording spans; span() becomes a no-op"""
+    global _enabled
+    _enabled = False
+
+def enabled():
+    return _enabled
+
+
+# ---------- SPANS ----------
+class _StageMetrics:
+    __slots__ = ("count", "errors", "seconds", "buckets", "pages", "bytes")
+
+    def __init__(self):
+        self.count = self.errors = self.pages = self.bytes = 0
+        self.seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+
+class _Span:
+    __slots__ = ("stage", "attrs", "start")
+
+    def __init__(self, stage, attrs):
+        self.stage = stage
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Attach counts (pages=, bytes=, ...) discovered inside the span"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record(self.stage, time.perf_counter() - self.start, self.attrs, exc_type is not None)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+def span(stage, **attrs):
+    """Context manager timing one pipeline stage (parse, clean, extract, ...)
+
+    Spans nest, and each records its inclusive time. When instrumentation is
+    off this returns a shared no-op object.
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(stage, attrs)
+
+def traced(stage):
+    """Decorator recording a span per call, with the size of a text first argument"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            attrs = {"bytes": len(args[0])} if args and isinstance(args[0], str) else {}
+            with _Span(stage, attrs):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _record(stage, seconds, attrs, failed):
+    with _lock:
+        metrics = _metrics.get(stage)
+        if metrics is None:
+            metrics = _metrics[stage] = _StageMetrics()
+        metrics.count += 1
+        metrics.seconds += seconds
+        metrics.errors += failed
+        metrics.pages += attrs.get("pages", 0)
+        metrics.bytes += attrs.get("bytes", 0)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                metrics.buckets[i] += 1
+                break
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            "event": "span", "stage": stage,
+            "duration_ms": round(seconds * 1000, 3), "error": failed, **attrs,
+        }))
+
+
+# ---------- EXPORT ----------
+def snapshot():
+    """Per-stage totals as plain dicts"""
+    with _lock:
+        return {
+            stage: {"count": m.count, "errors": m.errors, "seconds": m.seconds,
+                    "pages": m.pages, "bytes": m.bytes}
+            for stage, m in _metrics.items()
+        }
+
+def reset():
+    with _lock:
+        _metrics.clear()
+
+def prometheus_text():
+    """All recorded metrics in the Prometheus text exposition format"""
+    with _lock:
+        stages = sorted(_metrics.items())
+        lines = [
+            "# HELP ats_stage_duration_seconds Time spent in each scan pipeline stage.",
+            "# TYPE ats_stage_duration_seconds histogram",
+        ]
+        for stage, m in stages:
+            cumulative = 0
+            for bound, count in zip(BUCKETS, m.buckets):
+                cumulative += count
+                lines.append(f'ats_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'ats_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {m.count}')
+            lines.append(f'ats_stage_duration_seconds_sum{{stage="{stage}"}} {m.seconds}')
+            lines.append(f'ats_stage_duration_seconds_count{{stage="{stage}"}} {m.count}')
+
+        for name, attr, help_text in (
+            ("ats_stage_errors_total", "errors", "Stage calls that raised."),
+            ("ats_stage_pages_total", "pages", "Document pages processed per stage."),
+            ("ats_stage_bytes_total", "bytes", "Text characters processed per stage."),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for stage, m in stages:
+                lines.append(f'{name}{{stage="{stage}"}} {getattr(m, attr)}')
+    return "\n".join(lines) + "\n"
+
+
+# ---------- PROFILING ----------
+@contextmanager
+def profile_document(name, directory=None, threshold=None):
+    """cProfile one document, keeping the profile only if it was slow
+
+    Opt-in: does nothing unless `directory` or ATS_PROFILE_DIR is set.
+    Profiles slower than `threshold` seconds (ATS_PROFILE_THRESHOLD,
+    default 1.0) are dumped there as .prof files for pstats/snakeviz.
+    """
+    directory = directory or os.environ.get("ATS_PROFILE_DIR")
+    # cProfile can't nest; only the outermost document is profiled
+    if not directory or getattr(_state, "profiling", False):
+        yield
+        return
+
+    if threshold is None:
+        threshold = float(os.environ.get("ATS_PROFILE_THRESHOLD", "1.0"))
+
+    profiler = cProfile.Profile()
+    _state.profiling = True
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _state.profiling = False
+        elapsed = time.perf_counter() - start
+        if elapsed >= threshold:
+            os.makedirs(directory, exist_ok=True)
+            safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))
+            path = os.path.join(directory, f"{safe_name}-{int(time.time() * 1000)}.prof")
+            profiler.dump_stats(path)
+            logger.warning(json.dumps({
+                "event": "slow_document", "name": str(name),
+                "duration_ms": round(elapsed * 1000, 3), "profile": path,
+            }))
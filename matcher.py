@@ -0,0 +1,257 @@
+import re
+from bisect import bisect_left
+from collections import deque
+
+# One pass over lowercased text. Words keep the symbols that make skills
+# distinct: internal . / - (asp.net, ci/cd, scikit-learn) and a trailing
+# + or # (c++, c#) that no word character follows (python+django is two
+# words). Every other non-space character is matched on its own.
+TOKEN_RE = re.compile(r"([^\W_]+(?:[./\-][^\W_]+)*)((?:[+#]++(?!\w))?)|\S")
+
+# Last internal . / - of a word, where a trailing + or # attaches (c/c++)
+SEPARATOR_RE = re.compile(r"[./\-](?=[^./\-]*$)")
+
+# Alphanumeric pieces of a word (html/css -> html, css)
+PART_RE = re.compile(r"[^\W_]+")
+
+# A whole symbol-bearing word, used to classify taxonomy entries
+WORD_RE = re.compile(r"[^\W_]+(?:[./\-][^\W_]+)*[+#]*")
+
+# Whitespace-delimited chunks; no token ever spans two of them
+CHUNK_RE = re.compile(r"\S+")
+
+# Characters tokenized at once when long text is processed in windows
+WINDOW_CHARS = 64 * 1024
+
+
+# ---------- TOKENIZER ----------
+class TokenStream:
+    """Tokens of one document, produced in a single pass by tokenize()
+
+    `parts` are the alphanumeric pieces plain skills are matched against;
+    `tokens` are whole words, symbols included, for skills like c++ or
+    asp.net. The parallel `*_joined` flags say whether an item directly
+    follows the previous one (a single space, or a joining symbol inside a
+    word), which multi-word skills require.
+    """
+
+    __slots__ = ("parts", "parts_joined", "tokens", "tokens_joined",
+                 "symbols", "word_count", "has_email", "_vocabulary")
+
+    def __init__(self):
+        self.parts = []
+        self.parts_joined = []
+        self.tokens = []
+        self.tokens_joined = []
+        self.symbols = set()
+        self.word_count = 0
+        self.has_email = False
+        self._vocabulary = None
+
+    def mentions(self, prefix):
+        """True if any word starts with `prefix` (e.g. a section heading)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(set(self.parts) | set(self.tokens))
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, prefix)
+        return i < len(vocabulary) and vocabulary[i].startswith(prefix)
+
+
+def _is_domain(word):
+    """example.com-like: dotted, ending in an alphabetic TLD of 2+ letters"""
+    head, _, tld = word.rpartition(".")
+    return bool(head) and len(tld) >= 2 and tld.isalpha()
+
+def tokenize(text):
+    """Lowercase and tokenize text once into a TokenStream"""
+    text = text.lower()
+    stream = TokenStream()
+    parts, parts_joined = stream.parts, stream.parts_joined
+    tokens, tokens_joined = stream.tokens, stream.tokens_joined
+    symbols = stream.symbols
+
+    word_count = 0
+    prev_end = -1       # end of the previous match of any kind
+    last_word_end = -2  # end of the previous word
+    last_part_end = -2  # end of the previous part (c++ has none)
+    email_at = -1       # where a domain must start to complete an email
+
+    for m in TOKEN_RE.finditer(text):
+        start, end = m.span()
+        # Matches tile every non-space character, so a gap means whitespace
+        if start != prev_end:
+            word_count += 1
+        prev_end = end
+
+        body = m.group(1)
+        if body is None:
+            char = m.group()
+            symbols.add(char)
+            if char == "@" and last_word_end == start:
+                email_at = end
+            continue
+
+        suffix = m.group(2)
+        joined = start == last_word_end + 1 and text[start - 1] == " "
+        if start == email_at and _is_domain(body):
+            stream.has_email = True
+        separator = SEPARATOR_RE.search(body) if suffix else None
+        if separator:
+            # The suffix belongs to the last segment only: c/c++ is c and c++
+            tokens.append(body[:separator.start()])
+            tokens_joined.append(joined)
+            tokens.append(body[separator.end():] + suffix)
+            tokens_joined.append(False)
+        else:
+            tokens.append(body + suffix if suffix else body)
+            tokens_joined.append(joined)
+
+        pieces = [body] if body.isalnum() else PART_RE.findall(body)
+        if suffix:
+            # c++ / c# are not a "c"
+            pieces.pop()
+        for k, piece in enumerate(pieces):
+            parts.append(piece)
+            parts_joined.append(k > 0 or (start == last_part_end + 1 and text[start - 1] == " "))
+
+        last_word_end = end
+        last_part_end = -2 if suffix else end
+
+    stream.word_count = word_count
+    return stream
+
+
+# ---------- WINDOWS ----------
+def split_text(text, size=WINDOW_CHARS):
+    """Fixed-size slices of a string, each chunk at most `size` characters"""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+def iter_windows(chunks, overlap):
+    """Re-cut text chunks into windows that end between words
+
+    Yields (window, overlap_words). Each window repeats the last `overlap`
+    complete words of the one before (overlap_words of them, fewer at the
+    start), so a phrase of up to overlap + 1 words is whole in some
+    window. Tokenizing the windows in turn sees every word of the joined
+    chunks; only the repeated ones are seen twice. Chunks longer than
+    WINDOW_CHARS are split first, so a window stays about that size. A
+    "word" longer than that is split too; its rest starts the next window
+    and counts among that one's overlap_words.
+    """
+    carry = ""
+    carried = 0
+    # The last window ended inside a word too long to keep whole
+    split = False
+    for piece in chunks:
+        for chunk in split_text(piece) if len(piece) > WINDOW_CHARS else (piece,):
+            buffer = carry + chunk
+            starts = deque((m.start() for m in CHUNK_RE.finditer(buffer)), maxlen=overlap + 1)
+
+            # A word touching the end may continue in the next chunk
+            cut = len(buffer)
+            if starts and not buffer[-1].isspace():
+                cut = starts.pop()
+            if len(buffer) - cut > WINDOW_CHARS:
+                # One enormous "word"; split it rather than grow without bound
+                yield buffer, carried + _continues(buffer, split)
+                carry, carried, split = "", 0, True
+                continue
+            if cut:
+                yield buffer[:cut], carried + _continues(buffer, split)
+                split = False
+
+            while len(starts) > overlap:
+                starts.popleft()
+            carry = buffer[starts[0] if starts else cut:]
+            carried = len(starts)
+
+    if carry:
+        yield carry, carried + _continues(carry, split)
+
+def _continues(window, split):
+    """1 if a window starts with the rest of a split word, which was counted already"""
+    return int(split and not window[0].isspace())
+
+
+# ---------- SKILL MATCHER ----------
+class SkillMatcher:
+    """Single-pass skill matcher compiled once from a skills taxonomy
+
+    Plain skills (python, spring boot) are matched against word parts and
+    symbol-bearing ones (c++, asp.net, ci/cd) against whole tokens; either
+    way the token stream is walked once.
+    """
+
+    def __init__(self, taxonomy, aliases=None):
+        # Ordered, de-duplicated skill list
+        self.skills = list(dict.fromkeys(
+            skill for group in taxonomy.values() for skill in group
+        ))
+
+        # First word -> [(remaining words, skill), ...]
+        self._phrases = {}
+        self._symbol_phrases = {}
+        # Words in the longest phrase
+        self.max_words = 1
+        phrases = [(skill, skill) for skill in self.skills]
+        # Aliases (k8s -> kubernetes) report the canonical skill
+        phrases += list((aliases or {}).items())
+        for phrase, skill in phrases:
+            words = phrase.lower().split()
+            if not words:
+                continue
+            if all(PART_RE.fullmatch(word) for word in words):
+                table = self._phrases
+            elif all(WORD_RE.fullmatch(word) for word in words):
+                table = self._symbol_phrases
+            else:
+                # Can't be produced by the tokenizer (e.g. ".net")
+                continue
+            table.setdefault(words[0], []).append((tuple(words[1:]), skill))
+            self.max_words = max(self.max_words, len(words))
+
+    def find(self, text):
+        """Return the set of skills found in text"""
+        if len(text) > 2 * WINDOW_CHARS:
+            return self.find_chunks(split_text(text))
+        return self.find_tokens(tokenize(text))
+
+    def find_tokens(self, stream, found=None):
+        """Return the set of skills found in a TokenStream, added to `found` if given"""
+        if found is None:
+            found = set()
+        self._scan(stream.parts, stream.parts_joined, self._phrases, found)
+        if self._symbol_phrases:
+            self._scan(stream.tokens, stream.tokens_joined, self._symbol_phrases, found)
+        return found
+
+    def find_chunks(self, chunks):
+        """Return the skills found in a stream of text chunks
+
+        Gives the same result as find() on the joined chunks while holding
+        only one window plus a few boundary words in memory.
+        """
+        found = set()
+        for window, _ in iter_windows(chunks, self.max_words - 1):
+            self.find_tokens(tokenize(window), found)
+        return found
+
+    @staticmethod
+    def _scan(words, joined, phrases, found):
+        """Add skills from `phrases` occurring in `words` to `found`"""
+        n = len(words)
+        for i, word in enumerate(words):
+            candidates = phrases.get(word)
+            if not candidates:
+                continue
+            for rest, skill in candidates:
+                if skill in found:
+                    continue
+                j = i
+                for expected in rest:
+                    j += 1
+                    if j >= n or not joined[j] or words[j] != expected:
+                        break
+                else:
+                    found.add(skill)
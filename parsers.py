@@ -0,0 +1,240 @@
+import io
+import errno
+import logging
+
+logger = logging.getLogger("ats.parsers")
+
+# format -> [(name, iter_segments), ...], preferred (fastest) first
+PARSERS = {}
+
+# Bumped whenever a backend's text output changes, so cached text is invalidated
+PARSERS_VERSION = 1
+
+
+# ---------- FORMAT DETECTION ----------
+def detect_format(data):
+    """"pdf", "docx" or None, from a file's leading bytes
+
+    PDF readers accept junk before the %PDF- header, so the first KB is
+    searched; any ZIP container is taken for DOCX and left to the parser
+    to reject.
+    """
+    head = bytes(data[:1024])
+    if b"%PDF-" in head:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    return None
+
+def format_from_name(name):
+    """Format implied by a file extension, for files without a known signature"""
+    name = name.lower()
+    if name.endswith(".pdf"):
+        return "pdf"
+    if name.endswith(".docx"):
+        return "docx"
+    return None
+
+
+class ViewIO(io.RawIOBase):
+    """Read-only, seekable file over a buffer (bytes, memoryview, mmap)
+
+    Unlike BytesIO(data) it does not copy the buffer, so parsers can read
+    archive members straight out of a memory-mapped file.
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def readall(self):
+        data = self._view[self._pos:].tobytes()
+        self._pos = len(self._view)
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            # As a real file does; zipfile relies on it to spot short files
+            raise OSError(errno.EINVAL, "Invalid argument")
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+
+# ---------- REGISTRY ----------
+def register_parser(fmt, name, iter_segments, first=False):
+    """Add a text extraction backend for a format ("pdf", "docx")
+
+    `iter_segments(file)` takes a path or binary file object and yields
+    text segments: one per page for PDF, one per paragraph for DOCX. It
+    should import its library lazily and let ImportError escape when the
+    library is missing, so the next backend is used instead.
+    """
+    backends = PARSERS.setdefault(fmt, [])
+    backends[:] = [b for b in backends if b[0] != name]
+    backends.insert(0 if first else len(backends), (name, iter_segments))
+
+def registry_version():
+    """PARSERS_VERSION plus the registered backends, in preference order"""
+    backends = ";".join(
+        f"{fmt}={','.join(name for name, _ in candidates)}"
+        for fmt, candidates in sorted(PARSERS.items())
+    )
+    return f"{PARSERS_VERSION}:{backends}"
+
+def iter_segments(file, fmt, backends=None):
+    """Yield text segments of a file from the first backend that works
+
+    Backends are tried in registry order, or in the order of `backends`
+    (names) if given. One that is not installed, or that fails before
+    producing anything, is skipped and the file rewound; a failure after
+    segments were yielded is raised, since they can't be taken back.
+    """
+    candidates = PARSERS.get(fmt)
+    if not candidates:
+        raise ValueError(f"No parser registered for {fmt!r}")
+    if backends is not None:
+        by_name = dict(candidates)
+        candidates = [(name, by_name[name]) for name in backends]
+
+    error = None
+    for name, backend in candidates:
+        produced = False
+        try:
+            for segment in backend(file):
+                produced = True
+                yield segment
+            return
+        except ImportError as exc:
+            error = error or exc
+        except Exception as exc:
+            if produced:
+                raise
+            logger.info("%s parser %s failed: %s", fmt, name, exc)
+            error = exc
+        if hasattr(file, "seek"):
+            file.seek(0)
+    raise error
+
+
+# ---------- DOCX ----------
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+OFFICE_DOCUMENT = "/officeDocument"
+
+# Run children and their text, as python-docx renders them
+_RUN_TEXT = {f"{W}tab": "\t", f"{W}ptab": "\t", f"{W}cr": "\n", f"{W}noBreakHyphen": "-"}
+
+def _run_text(run, parts):
+    for child in run:
+        tag = child.tag
+        if tag == f"{W}t":
+            parts.append(child.text or "")
+        elif tag == f"{W}br":
+            # Page and column breaks have no text
+            if child.get(f"{W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+
+def _paragraph_text(paragraph):
+    parts = []
+    for child in paragraph:
+        if child.tag == f"{W}r":
+            _run_text(child, parts)
+        elif child.tag == f"{W}hyperlink":
+            for run in child.iterfind(f"{W}r"):
+                _run_text(run, parts)
+    return "".join(parts)
+
+def _main_part(archive):
+    """Name of the main document part, from the package relationships"""
+    from xml.etree import ElementTree
+
+    try:
+        rels = ElementTree.fromstring(archive.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(f"{RELS}Relationship"):
+        if rel.get("Type", "").endswith(OFFICE_DOCUMENT):
+            return rel.get("Target").lstrip("/")
+    return "word/document.xml"
+
+def iter_docx_stream(file):
+    """Stream body paragraphs straight from the DOCX XML
+
+    Yields the same text as python-docx's document.paragraphs without
+    building its object graph; each paragraph is discarded once read.
+    """
+    import zipfile
+    from xml.etree import ElementTree
+
+    with zipfile.ZipFile(file) as archive, archive.open(_main_part(archive)) as xml:
+        depth = 0
+        for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            # Direct children of w:body (document > body > child)
+            if depth == 2:
+                if element.tag == f"{W}p":
+                    yield _paragraph_text(element)
+                element.clear()
+
+def iter_docx_python_docx(file):
+    """Paragraphs via python-docx's document model"""
+    from docx import Document
+
+    for paragraph in Document(file).paragraphs:
+        yield paragraph.text
+
+
+# ---------- PDF ----------
+def iter_pdf_pdfium(file):
+    """Pages via pypdfium2 (PDFium), when installed"""
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(file)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+def iter_pdf_pypdf2(file):
+    """Pages via PyPDF2"""
+    from PyPDF2 import PdfReader
+
+    for page in PdfReader(file).pages:
+        yield page.extract_text() or ""
+
+
+register_parser("docx", "stream", iter_docx_stream)
+register_parser("docx", "python-docx", iter_docx_python_docx)
+register_parser("pdf", "pdfium", iter_pdf_pdfium)
+register_parser("pdf", "pypdf2", iter_pdf_pypdf2)
@@ -0,0 +1,215 @@
+import math
+import os
+import queue
+import struct
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from ats_engine import (
+    ALL_SKILL_BITS, ScanResult, ScoreComponents,
+    baseline_ats_score, job_match_score, read_document,
+)
+from ingest import time_limit, DEFAULT_TIMEOUT
+from parsers import ViewIO, detect_format
+
+# Bytes per ring buffer slot; larger documents are pickled to the worker instead
+SLOT_SIZE = 1 << 20
+
+# Slots per worker: one being scored, one being filled by the parent
+SLOTS_PER_WORKER = 2
+
+# Imported once by the fork server and inherited by every worker
+PRELOAD = ["ats_engine", "parsers", "PyPDF2"]
+
+# score, match (NaN: none), skills, sections, length, format, word count, warnings size
+RESULT_HEADER = struct.Struct("<ddddqqqI")
+BITS_SIZE = (ALL_SKILL_BITS.bit_length() + 7) // 8
+
+# Ring buffer of the worker process, attached once by _init_worker
+_segment = None
+
+
+# ---------- RESULT ENCODING ----------
+def _write_result(buf, offset, size, result):
+    """Pack a ScanResult into a slot; False if it does not fit"""
+    warnings = "\0".join(result.warnings).encode()
+    if RESULT_HEADER.size + BITS_SIZE + len(warnings) > size:
+        return False
+    skills, sections, length, format_score = result.components
+    match = math.nan if result.match_percentage is None else result.match_percentage
+    RESULT_HEADER.pack_into(buf, offset, result.score, match, skills, sections,
+                            length, format_score, result.word_count, len(warnings))
+    offset += RESULT_HEADER.size
+    buf[offset:offset + BITS_SIZE] = result.skill_bits.to_bytes(BITS_SIZE, "little")
+    offset += BITS_SIZE
+    buf[offset:offset + len(warnings)] = warnings
+    return True
+
+def _read_result(buf, offset):
+    score, match, skills, sections, length, format_score, words, size = \
+        RESULT_HEADER.unpack_from(buf, offset)
+    offset += RESULT_HEADER.size
+    bits = int.from_bytes(buf[offset:offset + BITS_SIZE], "little")
+    offset += BITS_SIZE
+    warnings = bytes(buf[offset:offset + size]).decode()
+    return ScanResult(
+        score, bits, warnings.split("\0") if warnings else [],
+        ScoreComponents(skills, sections, length, format_score), words,
+        None if math.isnan(match) else match,
+    )
+
+
+# ---------- WORKER ----------
+def _init_worker(name):
+    global _segment
+    # Workers share the parent's resource tracker, so attaching
+    # registers nothing new and the parent still unlinks the segment
+    _segment = shared_memory.SharedMemory(name)
+
+def _score_document(data, fmt, job_description):
+    if fmt == "text":
+        text = str(data, "utf-8")
+    else:
+        text = read_document(ViewIO(data), fmt)
+    if job_description:
+        return job_match_score(text, job_description)
+    return baseline_ats_score(text)
+
+def _score_slot(slot, length, fmt, job_description, timeout, slot_size):
+    """Score the document in a slot and write the result back over it
+
+    Returns None when the result is in the slot, else the ScanResult.
+    """
+    offset = slot * slot_size
+    buf = _segment.buf
+    with time_limit(timeout):
+        result = _score_document(buf[offset:offset + length], fmt, job_description)
+    if _write_result(buf, offset, slot_size, result):
+        return None
+    return result
+
+def _score_inline(data, fmt, job_description, timeout):
+    """Score a document too large for a slot"""
+    with time_limit(timeout):
+        return _score_document(data, fmt, job_description)
+
+
+# ---------- POOL ----------
+def _default_context():
+    # The fork server imports PRELOAD once and forks each worker from that
+    # state, without inheriting the parent's threads
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOAD)
+        return context
+    return multiprocessing.get_context("spawn")
+
+class ScoringPool:
+    """Long-lived process pool scoring resumes with a preloaded matcher
+
+    Documents go to workers through a shared memory ring buffer of
+    fixed-size slots: only (slot, length) crosses the pipe, and the result
+    (score, components, skill bitset, warnings) is written back over the
+    document in the same slot. Each worker imports the engine and builds
+    the skill matcher once, not per task.
+
+    Documents are PDF/DOCX bytes (the format is detected from the content)
+    or resume text as str. submit() blocks while every slot is in use.
+    """
+
+    def __init__(self, workers=None, slot_size=SLOT_SIZE, slots=None,
+                 timeout=DEFAULT_TIMEOUT, mp_context=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.slot_size = slot_size
+        self.slots = slots or self.workers * SLOTS_PER_WORKER
+        self.timeout = timeout
+        self._context = mp_context or _default_context()
+        self._segment = shared_memory.SharedMemory(create=True, size=self.slots * slot_size)
+        self._free = queue.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(self.workers, mp_context=self._context,
+                                   initializer=_init_worker, initargs=(self._segment.name,))
+
+    def submit(self, document, job_description=None):
+        """Score one document in the pool; returns a Future of a ScanResult"""
+        if isinstance(document, str):
+            data, fmt = document.encode(), "text"
+        else:
+            data, fmt = document, detect_format(document)
+            if fmt is None:
+                raise ValueError("Unsupported file type; expected a PDF or DOCX file")
+
+        length = len(data)
+        if length > self.slot_size:
+            return self._submit(_score_inline, bytes(data), fmt, job_description, self.timeout)
+
+        slot = self._free.get()
+        offset = slot * self.slot_size
+        self._segment.buf[offset:offset + length] = data
+        try:
+            inner = self._submit(_score_slot, slot, length, fmt, job_description,
+                                 self.timeout, self.slot_size)
+        except BaseException:
+            self._free.put(slot)
+            raise
+
+        future = Future()
+
+        def done(inner):
+            try:
+                result = inner.result()
+                if result is None:
+                    result = _read_result(self._segment.buf, offset)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            finally:
+                self._free.put(slot)
+
+        inner.add_done_callback(done)
+        return future
+
+    def _submit(self, fn, *args):
+        try:
+            return self._executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. a hostile file); start a fresh pool
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            return self._executor.submit(fn, *args)
+
+    def map(self, documents, job_description=None):
+        """Score documents, yielding ScanResults in input order
+
+        At most one document per slot is in flight, so `documents` may be
+        an arbitrarily long iterator.
+        """
+        in_flight = deque()
+        for document in documents:
+            if len(in_flight) >= self.slots:
+                yield in_flight.popleft().result()
+            in_flight.append(self.submit(document, job_description))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def close(self):
+        if self._segment is None:
+            return
+        self._executor.shutdown()
+        self._segment.close()
+        self._segment.unlink()
+        self._segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
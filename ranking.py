@@ -0,0 +1,205 @@
+import json
+import heapq
+import base64
+import sqlite3
+import itertools
+
+from ats_engine import compile_profile, skill_bits, ALL_SKILLS
+from history import jd_key
+
+# Results written to a ResultStore per transaction
+STORE_BATCH = 256
+
+# Points of each part of the baseline score, for bounding the score of a
+# resume whose skills are known but that has not been scored yet
+SKILL_POINTS, SECTION_POINTS, LENGTH_POINTS, FORMAT_POINTS = 45, 25, 15, 15
+
+
+# ---------- KEYS ----------
+def rank_key(result):
+    """Sort key: job match first (if any), then ATS score, then skill count"""
+    match = result["match_percentage"] or 0
+    return (-match, -result["score"], -len(result["skills_found"]), result["name"])
+
+
+# ---------- TOP-K ----------
+class _Kept:
+    """Heap entry ordered worst first, so the root is the one to evict"""
+
+    __slots__ = ("key", "result")
+
+    def __init__(self, key, result):
+        self.key = key
+        self.result = result
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+class TopK:
+    """Best k results of a stream under a sort key (smaller is better)
+
+    Holds at most k results in a heap whose root is the worst kept, so
+    each new result costs one comparison, plus O(log k) if it gets in.
+    """
+
+    def __init__(self, k, key=rank_key):
+        self.k = k
+        self.key = key
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def threshold(self):
+        """Key a result must beat to get in, or None while fewer than k are kept"""
+        if len(self._heap) < self.k:
+            return None
+        return self._heap[0].key
+
+    def admits(self, key):
+        """Could a result with this key (or any key >= it) still get in"""
+        if self.k <= 0:
+            return False
+        threshold = self.threshold
+        return threshold is None or key < threshold
+
+    def push(self, result):
+        """Offer a result; returns True if it was kept"""
+        key = self.key(result)
+        if not self.admits(key):
+            return False
+        entry = _Kept(key, result)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+        return True
+
+    def results(self):
+        """Kept results, best first"""
+        return [entry.result for entry in sorted(self._heap, key=lambda entry: entry.key)]
+
+def top_k(results, k, key=rank_key):
+    """Best k of a stream of results, best first, never holding more than k"""
+    top = TopK(k, key)
+    for result in results:
+        top.push(result)
+    return top.results()
+
+def top_k_bounded(candidates, k, score, bound, key=rank_key):
+    """Best k candidates, scoring only those that could still get in
+
+    `bound(candidate)` is the best key its result could have, and
+    `score(candidate)` produces the result. Candidates must come in
+    order of bound, best first: once one's bound can't beat the k-th
+    result kept, no later one can, and the rest are never scored.
+    """
+    top = TopK(k, key)
+    for candidate in candidates:
+        if not top.admits(bound(candidate)):
+            break
+        top.push(score(candidate))
+    return top.results()
+
+def top_k_indexed(index, k, score, job_description=None):
+    """Best k resumes of a SkillIndex, scoring as few as possible
+
+    Match percentage, skill count and the skill part of the ATS score
+    only depend on skills, which the index already holds, so every resume
+    gets its exact match and a bound on its ATS score for free. Resumes
+    are then scored (via `score(name)`, returning a result dict) in order
+    of that bound, stopping once none of the remaining ones can make the
+    top k.
+    """
+    profile = compile_profile(job_description) if job_description else None
+
+    bounds = []
+    for name in index.query():
+        skills = index.skills_of(name)
+        match = profile.match_percentage(skill_bits(skills)) if profile else 0
+        # Added up as score_tokens does, so the bound is never below the score
+        skill_score = (len(skills) / len(ALL_SKILLS)) * SKILL_POINTS
+        best = min(round(skill_score + SECTION_POINTS + LENGTH_POINTS + FORMAT_POINTS, 2), 100)
+        bounds.append((-match, -best, -len(skills), name))
+    bounds.sort()
+
+    return top_k_bounded(bounds, k, lambda b: score(b[3]), lambda b: b)
+
+
+# ---------- PERSISTED RESULTS ----------
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode("ascii")
+
+def decode_cursor(cursor):
+    return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+
+class ResultStore:
+    """Scored batch results in SQLite, paged in rank order
+
+    Rows are kept per job description with the rank_key columns indexed,
+    so a page is a range scan of the index starting after the cursor (the
+    last key of the previous page) however deep the page is.
+    """
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " job TEXT NOT NULL, name TEXT NOT NULL,"
+            " match_key REAL NOT NULL, score_key REAL NOT NULL, skills_key INTEGER NOT NULL,"
+            " result TEXT NOT NULL, PRIMARY KEY (job, name))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_rank"
+            " ON results (job, match_key, score_key, skills_key, name)"
+        )
+        self._conn.commit()
+
+    def add(self, results, job_description=None):
+        """Store result dicts, replacing earlier results for the same names"""
+        job = jd_key(job_description)
+        rows = ((job, *rank_key(result)[:3], result["name"], json.dumps(result))
+                for result in results)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results"
+                " (job, match_key, score_key, skills_key, name, result) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def tee(self, results, job_description=None):
+        """Yield results unchanged, storing them in batches as they pass"""
+        results = iter(results)
+        while batch := list(itertools.islice(results, STORE_BATCH)):
+            self.add(batch, job_description)
+            yield from batch
+
+    def page(self, job_description=None, limit=50, cursor=None):
+        """One page of results, best first: (results, cursor of the next page or None)"""
+        job = jd_key(job_description)
+        query = "SELECT match_key, score_key, skills_key, name, result FROM results WHERE job = ?"
+        params = [job]
+        if cursor is not None:
+            query += " AND (match_key, score_key, skills_key, name) > (?, ?, ?, ?)"
+            params += decode_cursor(cursor)
+        query += " ORDER BY match_key, score_key, skills_key, name LIMIT ?"
+        rows = self._conn.execute(query, (*params, limit + 1)).fetchall()
+
+        results = [json.loads(row[4]) for row in rows[:limit]]
+        next_cursor = encode_cursor(rows[limit - 1][:4]) if len(rows) > limit else None
+        return results, next_cursor
+
+    def top(self, k, job_description=None):
+        """Best k stored results"""
+        return self.page(job_description, k)[0]
+
+    def count(self, job_description=None):
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM results WHERE job = ?", (jd_key(job_description),)
+        ).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
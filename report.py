@@ -0,0 +1,229 @@
+import csv
+import io
+import json
+import hashlib
+import threading
+
+from ats_engine import TAXONOMY, result_dict
+from cache import LRUCache
+
+# Taxonomy category -> chart label; other categories are not charted
+CATEGORY_NAMES = {
+    "languages": "Languages",
+    "frameworks": "Frameworks",
+    "databases": "Databases",
+    "tools": "Tools",
+}
+
+# Chart label -> bitset of its skills, so counting is one AND per category
+CATEGORY_BITS = {name: 0 for name in CATEGORY_NAMES.values()}
+for _skill, _category in TAXONOMY.category_of.items():
+    if _category in CATEGORY_NAMES:
+        CATEGORY_BITS[CATEGORY_NAMES[_category]] |= 1 << TAXONOMY.skill_ids[_skill]
+
+CSV_FIELDS = ["rank", "name", "score", "match_percentage", "skills_count",
+              "missing_skills", "skills_found", "warnings", "duplicates",
+              "duplicate_of", "error"]
+
+# Rendered charts and reports, keyed by result hash; shared by all threads
+_rendered = LRUCache(max_entries=1024, max_bytes=16 * 1024 * 1024)
+_lock = threading.Lock()
+
+
+# ---------- CACHE ----------
+def result_key(result):
+    """Stable hash of everything a ScanResult reports"""
+    fields = (result.score, result.skill_bits, result.warnings, tuple(result.components),
+              result.word_count, result.match_percentage)
+    return hashlib.blake2b(repr(fields).encode(), digest_size=16).hexdigest()
+
+def _cached(kind, result, build, *args):
+    key = f"{kind}:{result_key(result)}:{args}"
+    with _lock:
+        value = _rendered.get(key)
+    if value is None:
+        value = build(result, *args)
+        with _lock:
+            _rendered.put(key, value, len(repr(value)))
+    return value
+
+def clear_cache():
+    with _lock:
+        _rendered.clear()
+
+
+# ---------- CHARTS ----------
+# Plotly figure specs as plain dicts: building them needs no plotly import,
+# and st.plotly_chart renders them directly. Cached specs are shared, so
+# callers must not modify them.
+def category_counts(result):
+    """(chart label, skills found) pairs in chart order"""
+    bits = result.skill_bits
+    return [(name, (bits & mask).bit_count()) for name, mask in CATEGORY_BITS.items()]
+
+def gauge_spec(result):
+    """ATS score gauge"""
+    return _cached("gauge", result, _gauge_spec)
+
+def _gauge_spec(result):
+    return {
+        "data": [{
+            "type": "indicator",
+            "mode": "gauge+number+delta",
+            "value": result.score,
+            "domain": {"x": [0, 1], "y": [0, 1]},
+            "title": {"text": "ATS Score", "font": {"size": 24, "color": "#1e293b"}},
+            "delta": {"reference": 70, "increasing": {"color": "#10b981"}},
+            "number": {"font": {"size": 40, "color": "#1e293b"}},
+            "gauge": {
+                "axis": {"range": [None, 100], "tickwidth": 2, "tickcolor": "#64748b"},
+                "bar": {"color": "#6366f1", "thickness": 0.8},
+                "bgcolor": "#f8fafc",
+                "borderwidth": 3,
+                "bordercolor": "#cbd5e1",
+                "steps": [
+                    {"range": [0, 50], "color": "#fee2e2"},
+                    {"range": [50, 75], "color": "#fef3c7"},
+                    {"range": [75, 100], "color": "#d1fae5"},
+                ],
+                "threshold": {
+                    "line": {"color": "#ef4444", "width": 4},
+                    "thickness": 0.8,
+                    "value": 90,
+                },
+            },
+        }],
+        "layout": {
+            "height": 300,
+            "margin": {"l": 20, "r": 20, "t": 50, "b": 20},
+            "paper_bgcolor": "#ffffff",
+            "font": {"color": "#1e293b", "family": "Inter"},
+        },
+    }
+
+def category_spec(result):
+    """Bar chart of found skills per category"""
+    return _cached("categories", result, _category_spec)
+
+def _category_spec(result):
+    counts = category_counts(result)
+    names = [name for name, _ in counts]
+    values = [count for _, count in counts]
+    return {
+        "data": [{
+            "type": "bar",
+            "x": names,
+            "y": values,
+            "marker": {"color": values, "coloraxis": "coloraxis"},
+        }],
+        "layout": {
+            "title": {"text": "Skills by Category"},
+            "coloraxis": {"colorscale": [[0, "#6366f1"], [1, "#8b5cf6"]],
+                          "colorbar": {"title": {"text": "Count"}}},
+            "showlegend": False,
+            "height": 300,
+            "paper_bgcolor": "#ffffff",
+            "plot_bgcolor": "#ffffff",
+            "font": {"family": "Inter", "color": "#1e293b"},
+            "title_font_color": "#1e293b",
+            "xaxis": {"title": {"text": "Category"}, "gridcolor": "#e2e8f0", "color": "#1e293b"},
+            "yaxis": {"title": {"text": "Count"}, "gridcolor": "#e2e8f0", "color": "#1e293b"},
+        },
+    }
+
+
+# ---------- SINGLE REPORTS ----------
+def text_report(result, generated):
+    """Plain-text report; `generated` is the timestamp line's text"""
+    return f"ATS RESUME ANALYSIS REPORT\nGenerated: {generated}\n\n" + _cached("txt", result, _text_body)
+
+def _text_body(result):
+    lines = [f"SCORE: {result.score}/100"]
+    if result.match_percentage is not None:
+        lines.append(f"JOB MATCH: {result.match_percentage}%")
+    lines += [
+        f"SKILLS FOUND: {result.skill_count}",
+        f"MISSING SKILLS: {result.missing_count}",
+        "",
+        "DETECTED SKILLS:",
+        ", ".join(sorted(result.skills_found)),
+        "",
+        "RECOMMENDATIONS:",
+    ]
+    lines += [f"- {warning}" for warning in result.warnings]
+    return "\n".join(lines) + "\n"
+
+def json_report(result, name):
+    """JSON report, as in batch JSON Lines output"""
+    return _cached("json", result, _json_report, name)
+
+def _json_report(result, name):
+    return json.dumps(result_dict(name, result), indent=2)
+
+def csv_report(result, name):
+    """CSV report with a header and one row"""
+    return _cached("csv", result, _csv_report, name)
+
+def _csv_report(result, name):
+    out = io.StringIO()
+    write_csv([result_dict(name, result)], out)
+    return out.getvalue()
+
+
+# ---------- BATCH REPORTS ----------
+# Batch writers take result dicts (ranked score_batch output, or error and
+# duplicate rows) and write each one as it arrives, so nothing is held back
+def write_csv(results, out):
+    """Stream results to a CSV file object"""
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for result in results:
+        writer.writerow(_row(result))
+
+def write_jsonl(results, out):
+    """Stream results to a JSON Lines file object"""
+    for result in results:
+        out.write(json.dumps(result) + "\n")
+
+def write_text(results, out):
+    """Stream a human-readable report, one block per candidate"""
+    out.write("ATS BATCH REPORT\n")
+    for result in results:
+        out.write("\n")
+        if "error" in result:
+            out.write(f"{result['name']}\n  could not be read: {result['error']}\n")
+            continue
+        if "duplicate_of" in result:
+            out.write(f"{result['name']}\n  near-duplicate of {result['duplicate_of']}\n")
+            continue
+
+        rank = result.get("rank")
+        out.write(f"{f'#{rank} ' if rank else ''}{result['name']}\n")
+        out.write(f"  Score: {result['score']}/100\n")
+        if result.get("match_percentage") is not None:
+            out.write(f"  Job match: {result['match_percentage']}%\n")
+        out.write(f"  Skills ({len(result['skills_found'])}): {', '.join(result['skills_found'])}\n")
+        for warning in result.get("warnings", []):
+            out.write(f"  - {warning}\n")
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "txt": write_text}
+
+def write_report(results, out, fmt):
+    """Stream results in one of WRITERS' formats"""
+    WRITERS[fmt](results, out)
+
+def _row(result):
+    """Flatten a result dict into a CSV row"""
+    return {
+        "rank": result.get("rank", ""),
+        "name": result["name"],
+        "score": result.get("score", ""),
+        "match_percentage": "" if result.get("match_percentage") is None else result["match_percentage"],
+        "skills_count": len(result.get("skills_found", [])),
+        "missing_skills": result.get("missing_skills", ""),
+        "skills_found": ";".join(result.get("skills_found", [])),
+        "warnings": " | ".join(result.get("warnings", [])),
+        "duplicates": ";".join(result.get("duplicates", [])),
+        "duplicate_of": result.get("duplicate_of", ""),
+        "error": result.get("error", ""),
+    }
@@ -0,0 +1,214 @@
+import os
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from aiohttp import web
+
+from ats_engine import baseline_ats_score, job_match_score, result_dict
+from cache import read_resume_bytes
+from parsers import detect_format
+from ingest import time_limit, ParseTimeout
+from history import ScanHistory
+import instrument
+
+# Requests allowed to wait for a worker before we answer 429
+DEFAULT_MAX_QUEUE = 32
+
+# Seconds a request may take end to end
+DEFAULT_TIMEOUT = 30
+
+# Largest accepted upload, in bytes
+DEFAULT_MAX_UPLOAD = 10 * 1024 * 1024
+
+
+# ---------- WORKER ----------
+def _scan(data, filename, job_description, timeout):
+    """Parse and score one upload; runs inside the executor
+
+    Returns the ScanResult, so the parent can log it before building the
+    response.
+    """
+    with time_limit(timeout), instrument.profile_document(filename):
+        resume_text = read_resume_bytes(data, filename)
+        if job_description:
+            return job_match_score(resume_text, job_description)
+        return baseline_ats_score(resume_text)
+
+
+# ---------- SCORER ----------
+class Scorer:
+    """Bounded front door to the CPU executor
+
+    At most `workers` scans run at once and `max_queue` more may wait;
+    anything beyond that is rejected straight away with 429. Completed
+    scans are logged to `history` (a history.ScanHistory) when given.
+    """
+
+    def __init__(self, workers=None, max_queue=DEFAULT_MAX_QUEUE,
+                 timeout=DEFAULT_TIMEOUT, executor=None, history=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + max_queue
+        self.timeout = timeout
+        self.history = history
+        self.pending = 0
+        self._owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(self.workers)
+
+    @property
+    def saturated(self):
+        return self.pending >= self.capacity
+
+    async def scan(self, data, filename, job_description=None):
+        if self.saturated:
+            raise web.HTTPTooManyRequests(
+                text="Scoring queue is full, retry later.",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        executor = self.executor
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                executor, _scan, data, filename, job_description, self.timeout
+            )
+            with instrument.span("request", endpoint="match" if job_description else "score"):
+                result = await asyncio.wait_for(future, self.timeout)
+        except (asyncio.TimeoutError, ParseTimeout):
+            raise web.HTTPGatewayTimeout(text=f"Scan took longer than {self.timeout}s.")
+        except BrokenProcessPool:
+            # A worker died (e.g. a hostile file); start a fresh pool
+            self._restart(executor)
+            raise web.HTTPUnprocessableEntity(text="Could not parse the uploaded file.")
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity(text=f"Could not parse the uploaded file: {exc}")
+        finally:
+            self.pending -= 1
+
+        # record() only buffers; the database is written in batches
+        if self.history is not None:
+            self.history.record(result, job_description=job_description)
+        return result_dict(filename, result)
+
+    def _restart(self, broken):
+        """Replace the pool `broken`, unless another request already has
+
+        One crash fails every scan in flight; only the first to notice
+        replaces the pool, so later ones don't cancel scans on the new one.
+        """
+        if self._owns_executor and self.executor is broken:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = ProcessPoolExecutor(self.workers)
+
+    def shutdown(self):
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+SCORER = web.AppKey("scorer", Scorer)
+
+
+# ---------- HANDLERS ----------
+async def _read_upload(request):
+    """(bytes, filename, job_description) from a multipart form"""
+    form = await request.post()
+    resume = form.get("resume")
+    if not isinstance(resume, web.FileField):
+        raise web.HTTPBadRequest(text="Upload the resume as a 'resume' file field.")
+    data = resume.file.read()
+    # Trust the content, not the filename or declared content type
+    if detect_format(data) is None:
+        raise web.HTTPUnsupportedMediaType(text="Resume must be a PDF or DOCX file.")
+
+    job_description = form.get("job_description")
+    if isinstance(job_description, web.FileField):
+        job_description = job_description.file.read().decode("utf-8", errors="replace")
+
+    return data, resume.filename, job_description
+
+async def score(request):
+    """POST /score: baseline ATS score"""
+    data, filename, _ = await _read_upload(request)
+    result = await request.app[SCORER].scan(data, filename)
+    return web.json_response(result)
+
+async def match(request):
+    """POST /match: ATS score plus job description match"""
+    data, filename, job_description = await _read_upload(request)
+    if not job_description or not job_description.strip():
+        raise web.HTTPBadRequest(text="A 'job_description' field is required.")
+    result = await request.app[SCORER].scan(data, filename, job_description)
+    return web.json_response(result)
+
+async def health(request):
+    """GET /healthz: the process is up"""
+    return web.json_response({"status": "ok"})
+
+async def ready(request):
+    """GET /readyz: the service can take another scan"""
+    scorer = request.app[SCORER]
+    body = {"pending": scorer.pending, "capacity": scorer.capacity}
+    if scorer.saturated:
+        return web.json_response({"status": "busy", **body}, status=503)
+    return web.json_response({"status": "ready", **body})
+
+async def metrics(request):
+    """GET /metrics: Prometheus metrics for spans recorded in this process
+
+    Stages that run inside executor processes are only visible here when
+    the service runs with an in-process executor.
+    """
+    return web.Response(text=instrument.prometheus_text(),
+                        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+
+# ---------- APP ----------
+def create_app(workers=None, max_queue=DEFAULT_MAX_QUEUE, timeout=DEFAULT_TIMEOUT,
+               max_upload=DEFAULT_MAX_UPLOAD, executor=None, history=None):
+    """Build the scoring web application
+
+    Pass an `executor` (e.g. a ThreadPoolExecutor) to run scans somewhere
+    other than a private process pool; it is then left to the caller to shut
+    down. Scans are logged to `history` (a history.ScanHistory), if given,
+    which the caller closes as well.
+    """
+    app = web.Application(client_max_size=max_upload)
+    app[SCORER] = Scorer(workers, max_queue, timeout, executor, history)
+
+    app.router.add_post("/score", score)
+    app.router.add_post("/match", match)
+    app.router.add_get("/healthz", health)
+    app.router.add_get("/readyz", ready)
+    app.router.add_get("/metrics", metrics)
+
+    async def shutdown(app):
+        app[SCORER].shutdown()
+    app.on_cleanup.append(shutdown)
+    return app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ATS scoring HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-w", "--workers", type=int, help="Scoring processes (default: one per CPU)")
+    parser.add_argument("-q", "--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"Requests allowed to wait for a worker (default: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument("-t", "--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds allowed per request (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--history", default=os.environ.get("ATS_HISTORY_PATH"),
+                        help="Log every scan to this SQLite scan history"
+                             " (default: $ATS_HISTORY_PATH, if set)")
+    args = parser.parse_args(argv)
+
+    history = ScanHistory(args.history) if args.history else None
+    app = create_app(args.workers, args.max_queue, args.timeout, history=history)
+    try:
+        web.run_app(app, host=args.host, port=args.port)
+    finally:
+        if history is not None:
+            history.close()
+
+if __name__ == "__main__":
+    main()
@@ -40,4 +40,16 @@ SOFTWARE_SKILLS = {
         "selenium", "cypress", "junit", "testng",
         "cucumber", "testing", "tdd", "bdd"
     ]
-}
\ No newline at end of file
+}
+
+# Alternative spellings reported as the canonical skill
+SKILL_ALIASES = {
+    "k8s": "kubernetes",
+    "golang": "go",
+    "postgres": "postgresql",
+    "sklearn": "scikit-learn",
+    "reactjs": "react",
+    "vuejs": "vue",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+}
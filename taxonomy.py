@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import struct
+import hashlib
+import argparse
+
+from skills import SOFTWARE_SKILLS, SKILL_ALIASES
+from matcher import SkillMatcher
+
+# Binary taxonomy layout (little-endian):
+#   header:  magic, version, category/skill/alias counts
+#   strings: category names, skill names, alias names (string tables)
+#   arrays:  uint16 category id per skill, uint32 target skill id per alias
+# A string table is n + 1 uint32 offsets followed by one UTF-8 blob.
+# It holds names and IDs only: the matcher is built by each process that
+# loads it (ScoringPool workers inherit it from the fork server).
+MAGIC = b"ATSTAX01"
+HEADER = struct.Struct("<8s16sIII")
+
+
+# ---------- TAXONOMY ----------
+class Taxonomy:
+    """Skills grouped by category, with integer IDs and aliases
+
+    Skill IDs are positions in `skills` (taxonomy order, duplicates
+    dropped). `aliases` maps alternative spellings to canonical skills,
+    e.g. "k8s" -> "kubernetes". Skill names and aliases are lowercased, as
+    the matcher sees them.
+    """
+
+    def __init__(self, categories, aliases=None):
+        self.categories = {
+            name: [_normalize(skill) for skill in skills] for name, skills in categories.items()
+        }
+        self.skills = list(dict.fromkeys(
+            skill for group in self.categories.values() for skill in group
+        ))
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+
+        # A skill listed under several categories belongs to the first one
+        self.category_of = {}
+        for name, group in self.categories.items():
+            for skill in group:
+                self.category_of.setdefault(skill, name)
+
+        self.aliases = {}
+        for alias, skill in (aliases or {}).items():
+            alias, skill = _normalize(alias), _normalize(skill)
+            if skill not in self.skill_ids:
+                raise ValueError(f"Alias {alias!r} points to unknown skill {skill!r}")
+            if alias not in self.skill_ids:
+                self.aliases[alias] = skill
+
+        self.version = hashlib.sha256(json.dumps(
+            {"categories": self.categories, "aliases": self.aliases}, sort_keys=True
+        ).encode()).hexdigest()[:16]
+        self._matcher = None
+
+    def __len__(self):
+        return len(self.skills)
+
+    @property
+    def matcher(self):
+        """SkillMatcher for this taxonomy, compiled on first use"""
+        if self._matcher is None:
+            self._matcher = SkillMatcher(self.categories, self.aliases)
+        return self._matcher
+
+    def to_dict(self):
+        return {"categories": self.categories, "aliases": self.aliases}
+
+    # ---- Binary format ----
+    def save(self, path):
+        """Write the taxonomy in the binary format"""
+        category_names = list(self.categories)
+        category_ids = {name: i for i, name in enumerate(category_names)}
+        aliases = sorted(self.aliases.items())
+
+        parts = [HEADER.pack(MAGIC, self.version.encode("ascii"),
+                             len(category_names), len(self.skills), len(aliases))]
+        parts.append(_string_table(category_names))
+        parts.append(_string_table(self.skills))
+        parts.append(_string_table([alias for alias, _ in aliases]))
+        parts.append(struct.pack(f"<{len(self.skills)}H",
+                                 *(category_ids[self.category_of[s]] for s in self.skills)))
+        parts.append(struct.pack(f"<{len(aliases)}I",
+                                 *(self.skill_ids[skill] for _, skill in aliases)))
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a taxonomy in the binary format
+
+        A fast-load format: one read and a few struct unpacks instead of
+        JSON parsing. Names are still decoded, and the matcher built, in
+        every process that loads it.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, n_categories, n_skills, n_aliases = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary skill taxonomy")
+
+        offset = HEADER.size
+        category_names, offset = _read_string_table(data, offset, n_categories)
+        skills, offset = _read_string_table(data, offset, n_skills)
+        alias_names, offset = _read_string_table(data, offset, n_aliases)
+        skill_categories = struct.unpack_from(f"<{n_skills}H", data, offset)
+        offset += 2 * n_skills
+        alias_targets = struct.unpack_from(f"<{n_aliases}I", data, offset)
+
+        categories = {name: [] for name in category_names}
+        for skill, category_id in zip(skills, skill_categories):
+            categories[category_names[category_id]].append(skill)
+        aliases = {alias: skills[i] for alias, i in zip(alias_names, alias_targets)}
+
+        taxonomy = cls(categories, aliases)
+        # Keep the source's version: skills listed under several categories
+        # are stored once, so the rebuilt category lists can differ from it
+        taxonomy.version = version.decode("ascii")
+        return taxonomy
+
+
+def _normalize(name):
+    return " ".join(name.lower().split())
+
+
+def _string_table(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(encoded)
+
+def _read_string_table(data, offset, count):
+    offsets = struct.unpack_from(f"<{count + 1}I", data, offset)
+    start = offset + 4 * (count + 1)
+    strings = [data[start + a:start + b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+    return strings, start + offsets[-1]
+
+
+# ---------- LOADING ----------
+def load_taxonomy(path=None):
+    """Load a taxonomy from a JSON file or the binary format
+
+    With no path the bundled skills.SOFTWARE_SKILLS and SKILL_ALIASES are used. JSON files are
+    either {"categories": {...}, "aliases": {...}} or a bare
+    category -> skills mapping.
+    """
+    if not path:
+        return Taxonomy(SOFTWARE_SKILLS, SKILL_ALIASES)
+
+    with open(path, "rb") as f:
+        is_binary = f.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        return Taxonomy.load(path)
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if "categories" in data:
+        return Taxonomy(data["categories"], data.get("aliases"))
+    return Taxonomy(data)
+
+
+# ---------- CLI ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile or inspect a skill taxonomy.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="Convert a JSON taxonomy to the binary format")
+    compile_cmd.add_argument("source", nargs="?", help="JSON taxonomy (default: bundled skills)")
+    compile_cmd.add_argument("output", help="Binary taxonomy path to write")
+
+    info_cmd = commands.add_parser("info", help="Summarize a taxonomy file")
+    info_cmd.add_argument("path", nargs="?", help="JSON or binary taxonomy (default: bundled skills)")
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        taxonomy = load_taxonomy(args.source)
+        taxonomy.save(args.output)
+        print(f"Wrote {args.output}: {len(taxonomy)} skills, "
+              f"{len(taxonomy.aliases)} aliases, version {taxonomy.version}")
+    else:
+        taxonomy = load_taxonomy(args.path)
+        print(f"version:    {taxonomy.version}")
+        print(f"skills:     {len(taxonomy)}")
+        print(f"aliases:    {len(taxonomy.aliases)}")
+        for name, group in taxonomy.categories.items():
+            print(f"  {name}: {len(group)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
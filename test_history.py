@@ -0,0 +1,34 @@
+import random
+
+from ats_engine import baseline_ats_score, job_match_score, SKILL_MATCHER
+from history import ScanHistory
+
+JOB = "Required: python, docker, kubernetes. Nice to have: aws"
+
+
+def random_scans(seed, count=40):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = " ".join(rng.sample(SKILL_MATCHER.skills, rng.randrange(30)))
+        if rng.random() < 0.5:
+            yield job_match_score(text, JOB), JOB
+        else:
+            yield baseline_ats_score(text), None
+
+
+def test_reads_count_buffered_scans_without_flushing(tmp_path):
+    history = ScanHistory(tmp_path / "history.sqlite3", batch_size=16, flush_interval=3600)
+    for result, job_description in random_scans(0):
+        history.record(result, job_description=job_description)
+    assert history._pending
+
+    counts = history.scan_counts()
+    summaries = [history.summary(JOB, top=5), history.summary(top=5),
+                 history.summary(all_jobs=True, top=5)]
+    assert history._pending
+
+    history.flush()
+    assert counts == history.scan_counts() == (40, 40)
+    assert summaries == [history.summary(JOB, top=5), history.summary(top=5),
+                         history.summary(all_jobs=True, top=5)]
+    history.close()
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from ats_engine import baseline_ats_score, job_match_score, SKILL_MATCHER
+from incremental import IncrementalScorer
+
+JOB = "python docker aws kubernetes machine learning"
+
+VOCABULARY = SKILL_MATCHER.skills + [
+    "amazon", "web", "services", "spring", "boot", "machine", "learning", "experience",
+    "education", "led", "team", "email@example.com", "|", "-", "\n", " ", "",
+]
+
+
+def whole(segments, job_description=None):
+    """Score of the segments joined, as read_docx joins paragraphs"""
+    text = " ".join(segments)
+    if job_description:
+        return job_match_score(text, job_description)
+    return baseline_ats_score(text)
+
+def random_segment(rng):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(rng.choice([0, 1, 1, 2, 8])))
+
+
+def test_skill_spanning_several_segments():
+    segments = ["I used amazon", "web", "services daily"]
+    result = IncrementalScorer().score(segments)
+    assert result.skills_found == ["aws"]
+    assert result == whole(segments)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_matches_whole(seed):
+    rng = random.Random(seed)
+    scorer = IncrementalScorer()
+    segments = []
+    for n in range(300):
+        if not segments or rng.random() < 0.2:
+            segments = [random_segment(rng) for _ in range(rng.randrange(8))]
+        else:
+            segments[rng.randrange(len(segments))] = random_segment(rng)
+        job_description = JOB if n % 2 else None
+        assert scorer.score(segments, job_description) == whole(segments, job_description), segments
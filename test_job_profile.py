@@ -0,0 +1,24 @@
+from ats_engine import (
+    compile_profile, JobProfile, REQUIRED_WEIGHT, DEFAULT_WEIGHT, PREFERRED_WEIGHT,
+)
+
+
+def test_bullet_with_cue_is_not_a_heading():
+    profile = JobProfile.from_text(
+        "Requirements:\n- Python\n- Master's degree preferred\n- Docker\n- Kubernetes")
+    assert profile.weights == {"python": REQUIRED_WEIGHT, "docker": REQUIRED_WEIGHT,
+                               "kubernetes": REQUIRED_WEIGHT}
+
+def test_sentence_with_cue_is_not_a_heading():
+    profile = JobProfile.from_text("Benefits: competitive salary plus bonus\nPython and Docker")
+    assert profile.weights == {"python": DEFAULT_WEIGHT, "docker": DEFAULT_WEIGHT}
+
+def test_headings():
+    profile = JobProfile.from_text(
+        "Nice to have\nDocker\nMinimum Requirements\nPython\nAbout us:\nKubernetes")
+    assert profile.weights == {"docker": PREFERRED_WEIGHT, "python": REQUIRED_WEIGHT,
+                               "kubernetes": DEFAULT_WEIGHT}
+
+def test_compile_profile_is_cached():
+    job_description = "Required: Python, Docker"
+    assert compile_profile(job_description) is compile_profile(job_description)
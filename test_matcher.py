@@ -0,0 +1,121 @@
+import re
+import random
+
+import pytest
+
+from ats_engine import (
+    clean, extract_skills, extract_skills_stream, baseline_ats_score_chunks,
+    score_tokens, SKILL_MATCHER,
+)
+from matcher import SkillMatcher, PART_RE, WINDOW_CHARS, tokenize
+from skills import SOFTWARE_SKILLS, SKILL_ALIASES
+
+# Skills made of plain words. Symbol-bearing ones (c++, asp.net, ci/cd)
+# deliberately stopped following the regex loop, which could never match
+# them on cleaned text.
+SKILLS = [skill for group in SOFTWARE_SKILLS.values() for skill in group
+          if all(PART_RE.fullmatch(word) for word in skill.split())]
+
+FILLER = ["led", "team", "built", "system", "data", "with", "and", "experience",
+          "education", "projects", "node.js", "html5", "c", "go-to", "r&d", "spring",
+          "boot", "machine", "learning", "sql", "server", "Python3", "email@example.com"]
+
+# Symbols touching a word on both sides (spring+boot) split phrases on
+# purpose, so they only appear next to whitespace here
+SEPARATORS = [" ", " ", " ", "  ", "\n", "\t", ", ", ". ", " | ", " (", ") ", "; ", " - "]
+
+
+def regex_skills(text):
+    """The original per-skill \\b...\\b loop over cleaned text"""
+    text = clean(text)
+    return {skill for skill in SKILLS if re.search(r"\b" + re.escape(skill) + r"\b", text)}
+
+def random_text(rng, words):
+    parts = []
+    for _ in range(words):
+        word = rng.choice(SKILLS) if rng.random() < 0.3 else rng.choice(FILLER)
+        if rng.random() < 0.2:
+            word = word.upper() if rng.random() < 0.5 else word.title()
+        parts.append(word)
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts)
+
+def corpus(seed, size=300):
+    rng = random.Random(seed)
+    return [random_text(rng, rng.choice([1, 5, 40, 300])) for _ in range(size)]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    # No aliases: the regex loop only knew canonical names
+    return SkillMatcher(SOFTWARE_SKILLS)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_matches_regex_loop(matcher, seed):
+    for text in corpus(seed):
+        assert matcher.find(text) & set(SKILLS) == regex_skills(text), text
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("Languages: C/C++, Python", {"c", "c++", "python"}),
+    ("Java/C++ developer", {"java", "c++"}),
+    ("C#/.NET", {"c#"}),
+    ("python+django", {"python", "django"}),
+    ("C++ and C# only", {"c++", "c#"}),
+    ("asp.net core, ci/cd, scikit-learn", {"asp.net", "ci/cd", "scikit-learn"}),
+])
+def test_symbol_bearing_skills(text, skills):
+    assert extract_skills(text) == skills
+
+def test_suffix_attaches_to_last_segment():
+    stream = tokenize("Java/C++ C#/.NET python+django")
+    assert stream.tokens == ["java", "c++", "c#", "net", "python", "django"]
+    assert stream.parts == ["java", "net", "python", "django"]
+    assert stream.word_count == 3
+
+
+# ---------- CHUNKED EXTRACTION ----------
+ALL_SKILLS = [skill for group in SOFTWARE_SKILLS.values() for skill in group]
+ALL_SEPARATORS = SEPARATORS + ["/", "-", "+", "#", "(", ")", "."]
+
+def rich_text(rng, words):
+    """Any skill, alias or filler word, joined by any separator"""
+    vocabulary = ALL_SKILLS + list(SKILL_ALIASES) + FILLER
+    return "".join(rng.choice(vocabulary) + rng.choice(ALL_SEPARATORS) for _ in range(words))
+
+def random_split(rng, text, pieces):
+    cuts = sorted(rng.randrange(len(text) + 1) for _ in range(pieces - 1))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_extract_skills_stream_matches_joined(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        text = rich_text(rng, rng.choice([1, 10, 200]))
+        chunks = random_split(rng, text, rng.randrange(1, 20))
+        assert extract_skills_stream(chunks) == extract_skills(text), chunks
+
+
+# ---------- WINDOWED SCORING ----------
+def baseline_ats_score_whole(text):
+    """baseline_ats_score with one tokenizer pass, whatever the size"""
+    resume = tokenize(text)
+    return score_tokens(resume, SKILL_MATCHER.find_tokens(resume))
+
+def test_windowed_score_matches_whole():
+    rng = random.Random(0)
+    text = rich_text(rng, 40_000)
+    assert len(text) > 2 * WINDOW_CHARS
+    chunks = random_split(rng, text, 50)
+    assert baseline_ats_score_chunks(chunks) == baseline_ats_score_whole(text)
+
+@pytest.mark.parametrize("separator", [" ", ""])
+def test_windowed_word_count_with_oversized_word(separator):
+    word = "x" * (WINDOW_CHARS * 2 + 123)
+    text = "python developer " + word + separator + "docker and kubernetes " * 3
+    chunks = random_split(random.Random(1), text, 7)
+    windowed = baseline_ats_score_chunks(chunks)
+    assert windowed.word_count == tokenize(text).word_count
+    assert windowed == baseline_ats_score_whole(text)
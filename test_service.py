@@ -0,0 +1,107 @@
+import io
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import docx
+from aiohttp import FormData
+from aiohttp.test_utils import TestClient, TestServer
+
+import service
+from service import create_app, Scorer
+
+RESUME = ("Experience: Python developer building Docker and Kubernetes services. "
+          "Education: BSc Computer Science. Skills: SQL, AWS, Git. Email: jane@example.com")
+
+
+def docx_bytes(text):
+    document = docx.Document()
+    document.add_paragraph(text)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+def upload(data, job_description=None):
+    form = FormData()
+    form.add_field("resume", data, filename="resume.docx")
+    if job_description is not None:
+        form.add_field("job_description", job_description)
+    return form
+
+def run(check, **options):
+    """Run `check(client)` against an in-process app on a thread pool"""
+    async def main():
+        with ThreadPoolExecutor(4) as executor:
+            app = create_app(executor=executor, **options)
+            async with TestClient(TestServer(app)) as client:
+                await check(client)
+    asyncio.run(main())
+
+
+def test_score():
+    async def check(client):
+        response = await client.post("/score", data=upload(docx_bytes(RESUME)))
+        assert response.status == 200
+        body = await response.json()
+        assert body["name"] == "resume.docx"
+        assert body["match_percentage"] is None
+        assert {"python", "docker", "kubernetes"} <= set(body["skills_found"])
+    run(check)
+
+def test_match():
+    async def check(client):
+        data = upload(docx_bytes(RESUME), "Required: Python, Docker. Nice to have: Rust")
+        response = await client.post("/match", data=data)
+        assert response.status == 200
+        assert 0 < (await response.json())["match_percentage"] < 100
+
+        response = await client.post("/match", data=upload(docx_bytes(RESUME)))
+        assert response.status == 400
+    run(check)
+
+def test_unsupported_media_type():
+    async def check(client):
+        response = await client.post("/score", data=upload(b"plain text, not a resume file"))
+        assert response.status == 415
+    run(check)
+
+def test_queue_full(monkeypatch):
+    release = threading.Event()
+
+    def blocked(*args):
+        release.wait(5)
+        raise RuntimeError("released")
+    monkeypatch.setattr(service, "_scan", blocked)
+
+    async def check(client):
+        first = asyncio.ensure_future(client.post("/score", data=upload(docx_bytes(RESUME))))
+        while not client.app[service.SCORER].pending:
+            await asyncio.sleep(0.01)
+        response = await client.post("/score", data=upload(docx_bytes(RESUME)))
+        assert response.status == 429
+        assert response.headers["Retry-After"] == "1"
+        assert (await client.get("/readyz")).status == 503
+        release.set()
+        assert (await first).status == 422
+    run(check, workers=1, max_queue=0)
+
+def test_timeout(monkeypatch):
+    monkeypatch.setattr(service, "_scan", lambda *args: time.sleep(0.5))
+
+    async def check(client):
+        response = await client.post("/score", data=upload(docx_bytes(RESUME)))
+        assert response.status == 504
+    run(check, timeout=0.1)
+
+
+def test_restart_replaces_a_broken_pool_once():
+    scorer = Scorer(workers=1)
+    broken = scorer.executor
+    scorer._restart(broken)
+    replacement = scorer.executor
+    assert replacement is not broken
+    # A second request failed by the same crash leaves the new pool alone
+    scorer._restart(broken)
+    assert scorer.executor is replacement
+    scorer.shutdown()
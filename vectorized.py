@@ -0,0 +1,100 @@
+import numpy as np
+
+from ats_engine import extract_skills, SKILL_MATCHER
+
+# Column order of every skill matrix
+SKILLS = SKILL_MATCHER.skills
+SKILL_IDS = {skill: i for i, skill in enumerate(SKILLS)}
+
+# ---------- ENCODING ----------
+def skill_vector(skills):
+    """Boolean vector over the taxonomy for a set of skill names"""
+    vector = np.zeros(len(SKILLS), dtype=bool)
+    vector[[SKILL_IDS[s] for s in skills if s in SKILL_IDS]] = True
+    return vector
+
+def encode(texts):
+    """(len(texts), n_skills) boolean matrix of skills found in each text"""
+    texts = list(texts)
+    matrix = np.zeros((len(texts), len(SKILLS)), dtype=bool)
+    for row, text in enumerate(texts):
+        ids = [SKILL_IDS[s] for s in extract_skills(text)]
+        matrix[row, ids] = True
+    return matrix
+
+def encode_skill_sets(skill_sets):
+    """Same as encode() for already extracted skill sets"""
+    skill_sets = list(skill_sets)
+    matrix = np.zeros((len(skill_sets), len(SKILLS)), dtype=bool)
+    for row, skills in enumerate(skill_sets):
+        matrix[row, [SKILL_IDS[s] for s in skills if s in SKILL_IDS]] = True
+    return matrix
+
+# ---------- SCORING ----------
+def _round_percentages(matched, totals):
+    """round(matched / total * 100, 2) elementwise, 0 where total is 0
+
+    Python's round is applied once per distinct (matched, total) pair, so
+    results are identical to the scalar code at a cost that depends on the
+    number of distinct pairs, not on the taxonomy size.
+    """
+    pairs, inverse = np.unique(np.stack([matched.ravel(), totals.ravel()]), axis=1,
+                               return_inverse=True)
+    table = np.array([round((int(m) / int(t)) * 100, 2) if t else 0.0
+                      for m, t in pairs.T])
+    return table[inverse.ravel()].reshape(matched.shape)
+
+def match_matrix(resumes, jds):
+    """Resumes x JDs job match percentages
+
+    Both arguments are boolean skill matrices from encode(). Entry [i, j]
+    is the share of JD j's skills found in resume i, every skill counting
+    once (0 when the JD has no known skills). See weighted_match_matrix
+    for the weighted percentages job_match_score reports.
+    """
+    resumes = np.asarray(resumes, dtype=np.float32)
+    jds = np.asarray(jds, dtype=np.float32)
+    # float32 matmul goes through BLAS and is exact for counts below 2**24
+    overlap = (resumes @ jds.T).astype(np.intp)
+    totals = jds.sum(axis=1).astype(np.intp)
+    totals = np.broadcast_to(totals[np.newaxis, :], overlap.shape)
+    return _round_percentages(overlap, totals)
+
+def skill_coverage(resumes):
+    """Skill coverage component (out of 45) of baseline_ats_score per resume"""
+    found = np.asarray(resumes, dtype=bool).sum(axis=1)
+    return found / len(SKILLS) * 45
+
+def encode_profiles(profiles):
+    """(len(profiles), n_skills) float matrix of JobProfile skill weights"""
+    profiles = list(profiles)
+    matrix = np.zeros((len(profiles), len(SKILLS)))
+    for row, profile in enumerate(profiles):
+        for skill, weight in profile.weights.items():
+            if skill in SKILL_IDS:
+                matrix[row, SKILL_IDS[skill]] = weight
+    return matrix
+
+def weighted_match_matrix(resumes, weights):
+    """Resumes x JDs weighted match percentages
+
+    `weights` comes from encode_profiles(). Entry [i, j] equals
+    JobProfile.match_percentage for resume i: profile weights are
+    multiples of 1/8, so the float64 sums are exact, and each distinct
+    value is rounded with Python's round.
+    """
+    resumes = np.asarray(resumes, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    matched = resumes @ weights.T
+    result = np.zeros_like(matched)
+    for j, total in enumerate(weights.sum(axis=1)):
+        if not total:
+            continue
+        values, inverse = np.unique(matched[:, j], return_inverse=True)
+        table = np.array([round((float(v) / total) * 100, 2) for v in values])
+        result[:, j] = table[inverse.ravel()]
+    return result
+
+def score_matrix(resume_texts, job_descriptions):
+    """Match percentage matrix straight from resume and JD texts"""
+    return match_matrix(encode(resume_texts), encode(job_descriptions))